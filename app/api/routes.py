@@ -1,17 +1,23 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Tuple
+import asyncio
+import hashlib
+import orjson
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi_cache.decorator import cache
+from celery.result import AsyncResult
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from datetime import datetime
 import logging
 from ..core.script_generator import ScriptGenerator
-from ..core.character_generator import CharacterGenerator
+from ..core.character_generator import CharacterGenerator, SeriesSpec
 from ..core.video_generator import VideoGenerator
 from ..core.youtube_integration import YouTubeIntegration
+from ..core.jobs import JobState, job_queue
+from ..core.cache import REDIS
+from ..workers import celery_app, upload_episode_task
 from ..database import get_db
 from sqlalchemy.orm import Session
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize router
@@ -23,6 +29,14 @@ character_generator = CharacterGenerator()
 video_generator = VideoGenerator()
 youtube_integration = YouTubeIntegration()
 
+# In-flight series generations keyed by config hash, so identical
+# concurrent submissions share a single pipeline run
+inflight_series: Dict[str, asyncio.Future] = {}
+
+# Completed series generations are remembered for a day, so retried
+# submissions of the same config reuse the result
+SERIES_CACHE_TTL = 86400
+
 # Pydantic models for request/response
 class SeriesConfig(BaseModel):
     title: str
@@ -47,6 +61,58 @@ class UploadRequest(BaseModel):
     episode_number: int
     video_data: Dict
 
+async def _generate_series(config: SeriesConfig) -> Tuple[Dict, Dict]:
+    """Generate series data and character profiles"""
+    # Generate series data
+    series_data = await run_in_threadpool(script_generator.create_new_series, config.dict())
+    
+    # Generate character profiles
+    characters = await character_generator.create_character_profiles(
+        SeriesSpec.from_series_data(series_data)
+    )
+    
+    return series_data, characters
+
+async def _generate_series_cached(key: str, config: SeriesConfig) -> Tuple[Dict, Dict]:
+    """Generate a series, reusing a stored result for the same config"""
+    cache_key = f"drama:series:{key}"
+    try:
+        cached = await REDIS.get(cache_key)
+        if cached is not None:
+            series_data, characters = orjson.loads(cached)
+            return series_data, characters
+    except Exception as e:
+        logger.warning("Failed to read series cache: %s", e)
+    
+    series_data, characters = await _generate_series(config)
+    
+    try:
+        await REDIS.set(
+            cache_key,
+            orjson.dumps([series_data, characters]),
+            ex=SERIES_CACHE_TTL
+        )
+    except Exception as e:
+        logger.warning("Failed to write series cache: %s", e)
+    
+    return series_data, characters
+
+async def _generate_series_once(config: SeriesConfig) -> Tuple[Dict, Dict]:
+    """Generate a series, joining an identical generation already in flight"""
+    key = hashlib.blake2b(
+        orjson.dumps(config.dict(), option=orjson.OPT_SORT_KEYS),
+        digest_size=16
+    ).hexdigest()
+    
+    task = inflight_series.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_generate_series_cached(key, config))
+        inflight_series[key] = task
+        task.add_done_callback(lambda _: inflight_series.pop(key, None))
+    
+    # Shield so one client disconnecting does not cancel the shared run
+    return await asyncio.shield(task)
+
 # API Routes
 @router.post("/series/create")
 async def create_series(
@@ -56,11 +122,7 @@ async def create_series(
 ):
     """Create a new drama series"""
     try:
-        # Generate series data
-        series_data = script_generator.create_new_series(config.dict())
-        
-        # Generate character profiles
-        characters = character_generator.create_character_profiles(series_data)
+        series_data, characters = await _generate_series_once(config)
         
         # Store in database
         # TODO: Implement database storage
@@ -76,7 +138,7 @@ async def create_series(
         }
         
     except Exception as e:
-        logger.error(f"Failed to create series: {str(e)}")
+        logger.exception("Failed to create series: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to create series: {str(e)}"
@@ -91,7 +153,7 @@ async def generate_episode(
     """Generate a new episode"""
     try:
         # Generate episode script
-        script = script_generator.generate_episode_script(
+        script = await script_generator.generate_episode_script(
             request.series_id,
             request.episode_number
         )
@@ -110,47 +172,55 @@ async def generate_episode(
         }
         
     except Exception as e:
-        logger.error(f"Failed to generate episode: {str(e)}")
+        logger.exception("Failed to generate episode: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate episode: {str(e)}"
         )
 
+async def _run_video_job(job: JobState, request: VideoRequest) -> Dict:
+    """Generate an episode video in the background"""
+    # Get character data
+    job.set_step("character_loading", 5)
+    characters = await run_in_threadpool(character_generator.get_characters, request.series_id)
+    
+    # Generate video
+    job.set_step("video_generation", 10)
+    video_data = await video_generator.generate_episode_video(
+        request.script,
+        characters
+    )
+    
+    # Store in database
+    # TODO: Implement database storage
+    
+    return {
+        "series_id": request.series_id,
+        "episode_number": request.episode_number,
+        "video_data": video_data
+    }
+
 @router.post("/video/generate")
 async def generate_video(
     request: VideoRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    """Generate video for an episode"""
+    """Queue video generation for an episode"""
     try:
-        # Get character data
-        characters = character_generator.get_characters(request.series_id)
-        
-        # Generate video
-        video_data = video_generator.generate_episode_video(
-            request.script,
-            characters
-        )
-        
-        # Store in database
-        # TODO: Implement database storage
+        job = await job_queue.submit("video_generation", _run_video_job, request)
         
         return {
-            "status": "success",
-            "message": "Video generated successfully",
-            "data": {
-                "series_id": request.series_id,
-                "episode_number": request.episode_number,
-                "video_data": video_data
-            }
+            "status": "queued",
+            "message": "Video generation queued",
+            "request_id": job.request_id
         }
         
     except Exception as e:
-        logger.error(f"Failed to generate video: {str(e)}")
+        logger.exception("Failed to queue video generation: %s", e)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to generate video: {str(e)}"
+            detail=f"Failed to queue video generation: {str(e)}"
         )
 
 @router.post("/video/upload")
@@ -159,49 +229,70 @@ async def upload_video(
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
-    """Upload video to YouTube"""
+    """Queue video upload to YouTube"""
     try:
         # Get series data
-        series_data = script_generator.get_series(request.series_id)
+        series_data = await run_in_threadpool(script_generator.get_series, request.series_id)
         
-        # Upload to YouTube
-        upload_data = youtube_integration.upload_episode(
+        # The upload runs in a Celery worker so the file transfer never
+        # occupies the API process or its job workers
+        task = await run_in_threadpool(
+            upload_episode_task.delay,
             request.video_data,
             series_data
         )
         
-        # Store in database
-        # TODO: Implement database storage
+        return {
+            "status": "queued",
+            "message": "Video upload queued",
+            "task_id": task.id
+        }
+        
+    except Exception as e:
+        logger.exception("Failed to queue video upload: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to queue video upload: {str(e)}"
+        )
+
+@router.get("/video/upload/{task_id}")
+async def get_upload_status(
+    task_id: str
+):
+    """Get the status of a queued video upload"""
+    try:
+        task = AsyncResult(task_id, app=celery_app)
+        state, result = await run_in_threadpool(lambda: (task.state, task.result))
         
         return {
             "status": "success",
-            "message": "Video uploaded successfully",
             "data": {
-                "series_id": request.series_id,
-                "episode_number": request.episode_number,
-                "upload_data": upload_data
+                "task_id": task_id,
+                "state": state,
+                "result": result if state == "SUCCESS" else None,
+                "error": str(result) if state == "FAILURE" else None
             }
         }
         
     except Exception as e:
-        logger.error(f"Failed to upload video: {str(e)}")
+        logger.exception("Failed to get upload status: %s", e)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to upload video: {str(e)}"
+            detail=f"Failed to get upload status: {str(e)}"
         )
 
 @router.get("/series/{series_id}")
+@cache(expire=60)
 async def get_series(
-    series_id: str,
-    db: Session = Depends(get_db)
+    series_id: str
 ):
     """Get series information"""
     try:
         # Get series data
-        series_data = script_generator.get_series(series_id)
+        series_data = await run_in_threadpool(script_generator.get_series, series_id)
         
         # Get character data
-        characters = character_generator.get_characters(series_id)
+        characters = await run_in_threadpool(character_generator.get_characters, series_id)
         
         return {
             "status": "success",
@@ -212,22 +303,23 @@ async def get_series(
         }
         
     except Exception as e:
-        logger.error(f"Failed to get series: {str(e)}")
+        logger.exception("Failed to get series: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get series: {str(e)}"
         )
 
 @router.get("/episode/{series_id}/{episode_number}")
+@cache(expire=60)
 async def get_episode(
     series_id: str,
-    episode_number: int,
-    db: Session = Depends(get_db)
+    episode_number: int
 ):
     """Get episode information"""
     try:
         # Get episode data
-        episode_data = script_generator.get_episode(
+        episode_data = await run_in_threadpool(
+            script_generator.get_episode,
             series_id,
             episode_number
         )
@@ -238,22 +330,23 @@ async def get_episode(
         }
         
     except Exception as e:
-        logger.error(f"Failed to get episode: {str(e)}")
+        logger.exception("Failed to get episode: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get episode: {str(e)}"
         )
 
 @router.get("/video/{series_id}/{episode_number}")
+@cache(expire=60)
 async def get_video(
     series_id: str,
-    episode_number: int,
-    db: Session = Depends(get_db)
+    episode_number: int
 ):
     """Get video information"""
     try:
         # Get video data
-        video_data = video_generator.get_video(
+        video_data = await run_in_threadpool(
+            video_generator.get_video,
             series_id,
             episode_number
         )
@@ -264,21 +357,21 @@ async def get_video(
         }
         
     except Exception as e:
-        logger.error(f"Failed to get video: {str(e)}")
+        logger.exception("Failed to get video: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get video: {str(e)}"
         )
 
 @router.get("/youtube/{series_id}")
+@cache(expire=60)
 async def get_youtube_data(
-    series_id: str,
-    db: Session = Depends(get_db)
+    series_id: str
 ):
     """Get YouTube channel data"""
     try:
         # Get channel data
-        channel_data = youtube_integration.get_channel_data(series_id)
+        channel_data = await run_in_threadpool(youtube_integration.get_channel_data, series_id)
         
         return {
             "status": "success",
@@ -286,7 +379,7 @@ async def get_youtube_data(
         }
         
     except Exception as e:
-        logger.error(f"Failed to get YouTube data: {str(e)}")
+        logger.exception("Failed to get YouTube data: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get YouTube data: {str(e)}"
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime
+import orjson
+from app.core.jobs import JobState, job_queue
 
 router = APIRouter()
 
@@ -30,19 +33,29 @@ class VideoRequest(BaseModel):
     script: Script
     youtube_settings: Optional[YouTubeSettings] = None
 
+async def _run_create_job(job: JobState, request: VideoRequest) -> Dict:
+    """Run video creation for a queued request"""
+    job.set_step("script_generation", 0)
+    # TODO: Implement video creation logic
+    return {"title": request.video_info.title}
+
+async def _event_stream(job: JobState) -> AsyncIterator[str]:
+    """Format job events as Server-Sent Events"""
+    async for event, data in job_queue.events(job):
+        yield f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
 @router.post("/create")
 async def create_video(request: VideoRequest):
     """
-    Create a new video with the provided information
+    Create a new video and stream its progress as Server-Sent Events
     """
     try:
-        # TODO: Implement video creation logic
-        return {
-            "status": "success",
-            "message": "Video creation request received",
-            "request_id": "123456",  # This will be a real ID in production
-            "estimated_completion_time": "30 minutes"
-        }
+        job = await job_queue.submit("video_creation", _run_create_job, request)
+        return StreamingResponse(
+            _event_stream(job),
+            media_type="text/event-stream",
+            headers={"X-Request-ID": job.request_id, "Cache-Control": "no-cache"}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -51,13 +64,17 @@ async def get_video_status(request_id: str):
     """
     Get the status of a video creation request
     """
+    job = job_queue.get(request_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown request: {request_id}")
+    
     try:
-        # TODO: Implement status check logic
         return {
-            "status": "processing",
-            "progress": 0,
-            "current_step": "script_generation",
-            "estimated_time_remaining": "25 minutes"
+            "status": job.status,
+            "progress": job.progress,
+            "current_step": job.current_step,
+            "result": job.result,
+            "error": job.error
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
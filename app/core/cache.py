@@ -0,0 +1,19 @@
+import os
+from redis import asyncio as aioredis
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Redis connection shared by the API process for cached responses
+REDIS = aioredis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"))
+
+def init_response_cache():
+    """Store cached GET responses in Redis"""
+    FastAPICache.init(RedisBackend(REDIS), prefix="drama")
+
+async def close_cache():
+    """Close the Redis connection"""
+    await REDIS.aclose()
@@ -1,158 +1,219 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Tuple
+import asyncio
 import openai
-import json
+import orjson
+import ijson
 import logging
-from datetime import datetime
+import threading
+import cachetools
+from dataclasses import dataclass
+from uuid import uuid4
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter
+)
 import os
+from string import Template
 from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from app.core.http import OPENAI as openai_client
+from app.database import SessionLocal
+from app.models.database import Character as CharacterORM, Series as SeriesORM
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class CharacterGenerator:
-    """Character generation system for AI drama series"""
+@dataclass(frozen=True)
+class SeriesSpec:
+    """Series settings the character pipeline reads"""
     
-    def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.character_memory = CharacterMemory()
+    series_id: str
+    title: str
+    genre: str
+    description: str
+    total_episodes: int
+    target_audience: str
+    tone: str
+    themes: Tuple[str, ...]
     
-    def create_character_profiles(self, series_config: Dict) -> List[Dict]:
-        """Create character profiles for a series"""
-        try:
-            # Generate main characters
-            main_characters = self.generate_main_characters(series_config)
-            
-            # Generate supporting characters
-            supporting_characters = self.generate_supporting_characters(
-                series_config,
-                main_characters
-            )
-            
-            # Generate character relationships
-            relationships = self.generate_character_relationships(
-                main_characters,
-                supporting_characters
-            )
-            
-            # Create character arcs
-            character_arcs = self.create_character_arcs(
-                main_characters,
-                series_config["total_episodes"]
-            )
-            
-            # Prepare character data
-            characters = {
-                "main_characters": main_characters,
-                "supporting_characters": supporting_characters,
-                "relationships": relationships,
-                "character_arcs": character_arcs
-            }
-            
-            # Save to character memory
-            self.character_memory.save_characters(series_config["series_id"], characters)
-            
-            return characters
-            
-        except Exception as e:
-            logger.error(f"Failed to create character profiles: {str(e)}")
-            raise
+    @classmethod
+    def from_series_data(cls, series_data: Dict) -> "SeriesSpec":
+        """Build from the series data returned by the script generator"""
+        config = series_data["config"]
+        return cls(
+            series_id=series_data["series_id"],
+            title=config["title"],
+            genre=config["genre"],
+            description=config["description"],
+            total_episodes=config["total_episodes"],
+            target_audience=config["target_audience"],
+            tone=config["tone"],
+            themes=tuple(config["themes"])
+        )
+
+# Prompt builders take characters already serialized with this, so a
+# pipeline dumps each cast list once however many prompts embed it
+def dump_prompt_json(data) -> str:
+    """Serialize data for embedding in a prompt"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+# Response models for generated character data. Extra keys returned by
+# the model are kept so nothing is silently dropped from the profiles.
+class CharacterProfile(BaseModel):
+    model_config = ConfigDict(extra="allow")
     
-    def generate_main_characters(self, series_config: Dict) -> List[Dict]:
-        """Generate main character profiles"""
-        try:
-            prompt = self.create_main_character_prompt(series_config)
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional character writer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            characters = json.loads(response.choices[0].message.content)
-            return self.validate_and_format_characters(characters)
-            
-        except Exception as e:
-            logger.error(f"Failed to generate main characters: {str(e)}")
-            raise
+    name: str
+    age: int
+    occupation: str
+    personality: List[str]
+    background: str
+    goals: List[str]
+    internal_conflicts: List[str]
+    external_conflicts: List[str]
+    arc_potential: str
+
+class SupportingCharacterProfile(BaseModel):
+    model_config = ConfigDict(extra="allow")
     
-    def generate_supporting_characters(self, series_config: Dict, main_characters: List[Dict]) -> List[Dict]:
-        """Generate supporting character profiles"""
-        try:
-            prompt = self.create_supporting_character_prompt(series_config, main_characters)
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional character writer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            characters = json.loads(response.choices[0].message.content)
-            return self.validate_and_format_characters(characters)
-            
-        except Exception as e:
-            logger.error(f"Failed to generate supporting characters: {str(e)}")
-            raise
+    name: str
+    age: int
+    occupation: str
+    relationships: Dict[str, str]
+    personality: List[str]
+    background: str
+    story_role: str
+
+class Relationship(BaseModel):
+    model_config = ConfigDict(extra="allow")
     
-    def generate_character_relationships(self, main_characters: List[Dict], supporting_characters: List[Dict]) -> Dict:
-        """Generate character relationships"""
-        try:
-            prompt = self.create_relationship_prompt(main_characters, supporting_characters)
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional relationship writer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            relationships = json.loads(response.choices[0].message.content)
-            return self.validate_and_format_relationships(relationships)
-            
-        except Exception as e:
-            logger.error(f"Failed to generate character relationships: {str(e)}")
-            raise
+    character1: str
+    character2: str
+    type: str
+    history: str
+    current_status: str
+    conflicts: List[str]
+    development: str
+
+class DevelopmentMoment(BaseModel):
+    model_config = ConfigDict(extra="allow")
     
-    def create_character_arcs(self, characters: List[Dict], total_episodes: int) -> Dict:
-        """Create character development arcs"""
-        try:
-            prompt = self.create_character_arc_prompt(characters, total_episodes)
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional character arc writer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            arcs = json.loads(response.choices[0].message.content)
-            return self.validate_and_format_arcs(arcs)
-            
-        except Exception as e:
-            logger.error(f"Failed to create character arcs: {str(e)}")
-            raise
+    episode: int
+    description: str
+
+class CharacterArc(BaseModel):
+    model_config = ConfigDict(extra="allow")
     
-    def create_main_character_prompt(self, series_config: Dict) -> str:
-        """Create prompt for main character generation"""
-        return f"""
-        Create main character profiles for a {series_config['genre']} drama series titled "{series_config['title']}".
+    starting_point: str
+    development_moments: List[DevelopmentMoment]
+    growth: str
+    final_state: str
+
+# Validators are built once; pydantic-core does the per-item work
+_CHARACTERS_ADAPTER = TypeAdapter(List[CharacterProfile])
+_SUPPORTING_CHARACTERS_ADAPTER = TypeAdapter(List[SupportingCharacterProfile])
+_RELATIONSHIPS_ADAPTER = TypeAdapter(List[Relationship])
+_ARCS_ADAPTER = TypeAdapter(Dict[str, CharacterArc])
+
+# Prompt templates are built once at import; only the dynamic values
+# are substituted per request
+_FULL_PROFILE_TPL = Template("""
+        Create the full cast for a $total_episodes-episode $genre drama series titled "$title".
+        
+        Requirements:
+        1. Create 3-5 main characters, each with:
+           - Name
+           - Age
+           - Occupation
+           - Personality traits
+           - Background story
+           - Goals and motivations
+           - Internal conflicts
+           - External conflicts
+           - Character arc potential
+        2. Create 5-8 supporting characters, each with:
+           - Name
+           - Age
+           - Occupation
+           - Relationship to main characters
+           - Personality traits
+           - Background story
+           - Role in the story
+        3. Define relationships between all characters, including:
+           - Relationship type
+           - History
+           - Current status
+           - Potential conflicts
+           - Development opportunities
+        4. Create development arcs for each main character, including:
+           - Starting point
+           - Key development moments
+           - Character growth
+           - Final state
+           - Episode milestones
+        
+        Format the response as a JSON object:
+        {
+            "main_characters": [
+                {
+                    "name": "string",
+                    "age": integer,
+                    "occupation": "string",
+                    "personality": ["string"],
+                    "background": "string",
+                    "goals": ["string"],
+                    "internal_conflicts": ["string"],
+                    "external_conflicts": ["string"],
+                    "arc_potential": "string"
+                }
+            ],
+            "supporting_characters": [
+                {
+                    "name": "string",
+                    "age": integer,
+                    "occupation": "string",
+                    "relationships": {
+                        "main_character_name": "relationship description"
+                    },
+                    "personality": ["string"],
+                    "background": "string",
+                    "story_role": "string"
+                }
+            ],
+            "relationships": [
+                {
+                    "character1": "string",
+                    "character2": "string",
+                    "type": "string",
+                    "history": "string",
+                    "current_status": "string",
+                    "conflicts": ["string"],
+                    "development": "string"
+                }
+            ],
+            "character_arcs": {
+                "character_name": {
+                    "starting_point": "string",
+                    "development_moments": [
+                        {
+                            "episode": integer,
+                            "description": "string"
+                        }
+                    ],
+                    "growth": "string",
+                    "final_state": "string"
+                }
+            }
+        }
+        """)
+
+_MAIN_CHARACTER_TPL = Template("""
+        Create main character profiles for a $genre drama series titled "$title".
         
         Requirements:
         1. Create 3-5 main characters
@@ -167,29 +228,29 @@ class CharacterGenerator:
            - External conflicts
            - Character arc potential
         
-        Format the response as a JSON array of character objects:
-        [
-            {{
-                "name": "string",
-                "age": integer,
-                "occupation": "string",
-                "personality": ["string"],
-                "background": "string",
-                "goals": ["string"],
-                "internal_conflicts": ["string"],
-                "external_conflicts": ["string"],
-                "arc_potential": "string"
-            }}
-        ]
-        """
-    
-    def create_supporting_character_prompt(self, series_config: Dict, main_characters: List[Dict]) -> str:
-        """Create prompt for supporting character generation"""
-        return f"""
-        Create supporting character profiles for a {series_config['genre']} drama series titled "{series_config['title']}".
+        Format the response as a JSON object with a list of character objects:
+        {
+            "characters": [
+                {
+                    "name": "string",
+                    "age": integer,
+                    "occupation": "string",
+                    "personality": ["string"],
+                    "background": "string",
+                    "goals": ["string"],
+                    "internal_conflicts": ["string"],
+                    "external_conflicts": ["string"],
+                    "arc_potential": "string"
+                }
+            ]
+        }
+        """)
+
+_SUPPORTING_CHARACTER_TPL = Template("""
+        Create supporting character profiles for a $genre drama series titled "$title".
         
         Main Characters:
-        {json.dumps(main_characters, indent=2)}
+        $main_characters
         
         Requirements:
         1. Create 5-8 supporting characters
@@ -202,32 +263,32 @@ class CharacterGenerator:
            - Background story
            - Role in the story
         
-        Format the response as a JSON array of character objects:
-        [
-            {{
-                "name": "string",
-                "age": integer,
-                "occupation": "string",
-                "relationships": {{
-                    "main_character_name": "relationship description"
-                }},
-                "personality": ["string"],
-                "background": "string",
-                "story_role": "string"
-            }}
-        ]
-        """
-    
-    def create_relationship_prompt(self, main_characters: List[Dict], supporting_characters: List[Dict]) -> str:
-        """Create prompt for relationship generation"""
-        return f"""
+        Format the response as a JSON object with a list of character objects:
+        {
+            "characters": [
+                {
+                    "name": "string",
+                    "age": integer,
+                    "occupation": "string",
+                    "relationships": {
+                        "main_character_name": "relationship description"
+                    },
+                    "personality": ["string"],
+                    "background": "string",
+                    "story_role": "string"
+                }
+            ]
+        }
+        """)
+
+_RELATIONSHIP_TPL = Template("""
         Create character relationships for a drama series.
         
         Main Characters:
-        {json.dumps(main_characters, indent=2)}
+        $main_characters
         
         Supporting Characters:
-        {json.dumps(supporting_characters, indent=2)}
+        $supporting_characters
         
         Requirements:
         1. Define relationships between all characters
@@ -239,9 +300,9 @@ class CharacterGenerator:
            - Development opportunities
         
         Format the response as a JSON object:
-        {{
+        {
             "relationships": [
-                {{
+                {
                     "character1": "string",
                     "character2": "string",
                     "type": "string",
@@ -249,18 +310,16 @@ class CharacterGenerator:
                     "current_status": "string",
                     "conflicts": ["string"],
                     "development": "string"
-                }}
+                }
             ]
-        }}
-        """
-    
-    def create_character_arc_prompt(self, characters: List[Dict], total_episodes: int) -> str:
-        """Create prompt for character arc generation"""
-        return f"""
-        Create character development arcs for a {total_episodes}-episode drama series.
+        }
+        """)
+
+_CHARACTER_ARC_TPL = Template("""
+        Create character development arcs for a $total_episodes-episode drama series.
         
         Characters:
-        {json.dumps(characters, indent=2)}
+        $characters
         
         Requirements:
         1. Create development arcs for each character
@@ -272,82 +331,330 @@ class CharacterGenerator:
            - Episode milestones
         
         Format the response as a JSON object:
-        {{
-            "character_arcs": {{
-                "character_name": {{
+        {
+            "character_arcs": {
+                "character_name": {
                     "starting_point": "string",
                     "development_moments": [
-                        {{
+                        {
                             "episode": integer,
                             "description": "string"
-                        }}
+                        }
                     ],
                     "growth": "string",
                     "final_state": "string"
-                }}
-            }}
-        }}
-        """
+                }
+            }
+        }
+        """)
+
+class CharacterGenerator:
+    """Character generation system for AI drama series"""
+    
+    def __init__(self):
+        self.openai_client = openai_client
+        self.model = os.getenv("CHARACTER_MODEL", "gpt-4o-mini")
+        self.character_memory = CharacterMemory()
+    
+    async def create_character_profiles(self, series: SeriesSpec) -> Dict:
+        """Create character profiles for a series"""
+        try:
+            # Generate characters, relationships and arcs in a single request
+            prompt = self.create_full_profile_prompt(series)
+            profiles = await self.complete_json(
+                "You are a professional character writer.",
+                prompt,
+                max_tokens=6000
+            )
+            
+            # Prepare character data
+            characters = {
+                "main_characters": self.validate_and_format_characters(
+                    profiles["main_characters"]
+                ),
+                "supporting_characters": self.validate_and_format_supporting_characters(
+                    profiles["supporting_characters"]
+                ),
+                "relationships": self.validate_and_format_relationships(
+                    {"relationships": profiles["relationships"]}
+                ),
+                "character_arcs": self.validate_and_format_arcs(
+                    {"character_arcs": profiles["character_arcs"]}
+                )
+            }
+            
+            # Save to character memory
+            await asyncio.to_thread(
+                self.character_memory.save_characters,
+                series,
+                characters
+            )
+            
+            return characters
+            
+        except Exception as e:
+            logger.error("Failed to create character profiles: %s", e)
+            raise
+    
+    def get_characters(self, series_id: str) -> Dict:
+        """Get character data for a series"""
+        return self.character_memory.get_characters(series_id)
+    
+    @retry(
+        stop=stop_after_attempt(4),
+        wait=wait_exponential_jitter(initial=1, max=10),
+        retry=retry_if_exception_type((openai.RateLimitError, openai.APIConnectionError)),
+        reraise=True
+    )
+    async def complete_json(self, system_prompt: str, prompt: str, max_tokens: int = 2000) -> Dict:
+        """Run a streamed chat completion in JSON mode and parse the response"""
+        stream = await self.openai_client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            stream=True
+        )
+        
+        # Feed tokens to the parser as they arrive so parsing overlaps
+        # with generation instead of starting after the last token
+        results = ijson.sendable_list()
+        parser = ijson.items_coro(results, "", use_float=True)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parser.send(chunk.choices[0].delta.content.encode("utf-8"))
+        parser.close()
+        
+        if not results:
+            raise ValueError("Empty response from OpenAI")
+        return results[0]
+    
+    async def generate_main_characters(self, series: SeriesSpec) -> List[Dict]:
+        """Generate main character profiles"""
+        try:
+            prompt = self.create_main_character_prompt(series)
+            characters = await self.complete_json(
+                "You are a professional character writer.",
+                prompt
+            )
+            return self.validate_and_format_characters(characters["characters"])
+            
+        except Exception as e:
+            logger.error("Failed to generate main characters: %s", e)
+            raise
+    
+    async def generate_supporting_characters(self, series: SeriesSpec, main_json: str) -> List[Dict]:
+        """Generate supporting character profiles"""
+        try:
+            prompt = self.create_supporting_character_prompt(series, main_json)
+            characters = await self.complete_json(
+                "You are a professional character writer.",
+                prompt
+            )
+            return self.validate_and_format_supporting_characters(characters["characters"])
+            
+        except Exception as e:
+            logger.error("Failed to generate supporting characters: %s", e)
+            raise
+    
+    async def generate_character_relationships(self, main_json: str, supporting_json: str) -> Dict:
+        """Generate character relationships"""
+        try:
+            prompt = self.create_relationship_prompt(main_json, supporting_json)
+            relationships = await self.complete_json(
+                "You are a professional relationship writer.",
+                prompt
+            )
+            return self.validate_and_format_relationships(relationships)
+            
+        except Exception as e:
+            logger.error("Failed to generate character relationships: %s", e)
+            raise
+    
+    async def create_character_arcs(self, characters_json: str, total_episodes: int) -> Dict:
+        """Create character development arcs"""
+        try:
+            prompt = self.create_character_arc_prompt(characters_json, total_episodes)
+            arcs = await self.complete_json(
+                "You are a professional character arc writer.",
+                prompt
+            )
+            return self.validate_and_format_arcs(arcs)
+            
+        except Exception as e:
+            logger.error("Failed to create character arcs: %s", e)
+            raise
+    
+    def create_full_profile_prompt(self, series: SeriesSpec) -> str:
+        """Create prompt that generates characters, relationships and arcs together"""
+        return _FULL_PROFILE_TPL.substitute(
+            total_episodes=series.total_episodes,
+            genre=series.genre,
+            title=series.title
+        )
+    
+    def create_main_character_prompt(self, series: SeriesSpec) -> str:
+        """Create prompt for main character generation"""
+        return _MAIN_CHARACTER_TPL.substitute(
+            genre=series.genre,
+            title=series.title
+        )
+    
+    def create_supporting_character_prompt(self, series: SeriesSpec, main_json: str) -> str:
+        """Create prompt for supporting character generation"""
+        return _SUPPORTING_CHARACTER_TPL.substitute(
+            genre=series.genre,
+            title=series.title,
+            main_characters=main_json
+        )
+    
+    def create_relationship_prompt(self, main_json: str, supporting_json: str) -> str:
+        """Create prompt for relationship generation"""
+        return _RELATIONSHIP_TPL.substitute(
+            main_characters=main_json,
+            supporting_characters=supporting_json
+        )
+    
+    def create_character_arc_prompt(self, characters_json: str, total_episodes: int) -> str:
+        """Create prompt for character arc generation"""
+        return _CHARACTER_ARC_TPL.substitute(
+            total_episodes=total_episodes,
+            characters=characters_json
+        )
     
     def validate_and_format_characters(self, characters: List[Dict]) -> List[Dict]:
         """Validate and format character profiles"""
-        required_fields = [
-            "name", "age", "occupation", "personality",
-            "background", "goals", "internal_conflicts",
-            "external_conflicts", "arc_potential"
+        return [
+            character.model_dump()
+            for character in _CHARACTERS_ADAPTER.validate_python(characters)
+        ]
+    
+    def validate_and_format_supporting_characters(self, characters: List[Dict]) -> List[Dict]:
+        """Validate and format supporting character profiles"""
+        return [
+            character.model_dump()
+            for character in _SUPPORTING_CHARACTERS_ADAPTER.validate_python(characters)
         ]
-        
-        for character in characters:
-            for field in required_fields:
-                if field not in character:
-                    raise ValueError(f"Missing required field in character: {field}")
-        
-        return characters
     
     def validate_and_format_relationships(self, relationships: Dict) -> Dict:
         """Validate and format character relationships"""
-        required_fields = [
-            "character1", "character2", "type",
-            "history", "current_status", "conflicts",
-            "development"
-        ]
-        
-        for relationship in relationships["relationships"]:
-            for field in required_fields:
-                if field not in relationship:
-                    raise ValueError(f"Missing required field in relationship: {field}")
-        
-        return relationships
+        return {
+            "relationships": [
+                relationship.model_dump()
+                for relationship in _RELATIONSHIPS_ADAPTER.validate_python(
+                    relationships["relationships"]
+                )
+            ]
+        }
     
     def validate_and_format_arcs(self, arcs: Dict) -> Dict:
         """Validate and format character arcs"""
-        required_fields = [
-            "starting_point", "development_moments",
-            "growth", "final_state"
-        ]
-        
-        for character, arc in arcs["character_arcs"].items():
-            for field in required_fields:
-                if field not in arc:
-                    raise ValueError(f"Missing required field in character arc: {field}")
-        
-        return arcs
+        return {
+            "character_arcs": {
+                character: arc.model_dump()
+                for character, arc in _ARCS_ADAPTER.validate_python(
+                    arcs["character_arcs"]
+                ).items()
+            }
+        }
 
 class CharacterMemory:
     """Character memory system for maintaining character data"""
     
     def __init__(self):
         # Initialize database connection
-        pass
+        # Character data is read on most requests for a series, so keep
+        # recently used series in memory for a few minutes
+        self.cache = cachetools.TTLCache(maxsize=1024, ttl=300)
+        self.cache_lock = threading.RLock()
     
-    def save_characters(self, series_id: str, characters: Dict):
+    def save_characters(self, series: SeriesSpec, characters: Dict):
         """Save character data to database"""
-        pass
+        series_id = series.series_id
+        rows = [
+            self.build_character_row(series_id, "main", character, characters)
+            for character in characters["main_characters"]
+        ] + [
+            self.build_character_row(series_id, "supporting", character, characters)
+            for character in characters["supporting_characters"]
+        ]
+        
+        # Series data itself lives in StoryMemory, so write the parent
+        # row the characters reference in the same transaction. One
+        # executemany round-trip covers the whole cast.
+        with SessionLocal() as session:
+            session.execute(
+                pg_insert(SeriesORM)
+                .values(
+                    id=series_id,
+                    title=series.title,
+                    genre=series.genre,
+                    description=series.description,
+                    total_episodes=series.total_episodes,
+                    target_audience=series.target_audience,
+                    tone=series.tone,
+                    themes=list(series.themes)
+                )
+                .on_conflict_do_nothing(index_elements=["id"])
+            )
+            session.execute(insert(CharacterORM), rows)
+            session.commit()
+        
+        self.invalidate(series_id)
+    
+    def build_character_row(self, series_id: str, role: str, character: Dict, characters: Dict) -> Dict:
+        """Build a characters table row from a generated profile"""
+        name = character["name"]
+        relationships = [
+            relationship
+            for relationship in characters["relationships"]["relationships"]
+            if name in (relationship["character1"], relationship["character2"])
+        ]
+        
+        return {
+            "id": uuid4().hex,
+            "series_id": series_id,
+            "name": name,
+            "role": role,
+            "age": character["age"],
+            "occupation": character["occupation"],
+            "personality": character["personality"],
+            "background": character["background"],
+            "goals": character.get("goals", []),
+            "secrets": character.get("secrets", []),
+            "profile": {
+                **character,
+                "cast_relationships": relationships,
+                "arc": characters["character_arcs"]["character_arcs"].get(name)
+            }
+        }
     
     def get_characters(self, series_id: str) -> Dict:
-        """Get character data from database"""
+        """Get character data, served from cache when available"""
+        with self.cache_lock:
+            characters = self.cache.get(series_id)
+        if characters is not None:
+            return characters
+        
+        characters = self.load_characters(series_id)
+        if characters is not None:
+            with self.cache_lock:
+                self.cache[series_id] = characters
+        return characters
+    
+    def load_characters(self, series_id: str) -> Dict:
+        """Load character data from database"""
         pass
     
     def update_character_state(self, series_id: str, character_name: str, state: Dict):
         """Update character state"""
-        pass 
\ No newline at end of file
+        self.invalidate(series_id)
+    
+    def invalidate(self, series_id: str):
+        """Drop cached character data for a series"""
+        with self.cache_lock:
+            self.cache.pop(series_id, None)
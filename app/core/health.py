@@ -0,0 +1,101 @@
+from typing import Awaitable, Dict, List, Optional
+import asyncio
+import logging
+import os
+from datetime import datetime
+from sqlalchemy import text
+from app.database import engine
+from app.core.cache import REDIS
+from app.core.jobs import job_queue
+
+logger = logging.getLogger(__name__)
+
+# Seconds between dependency probes, and the most a single probe may take
+HEALTH_INTERVAL = float(os.getenv("HEALTH_INTERVAL", "5"))
+HEALTH_TIMEOUT = 2.0
+
+class HealthProber:
+    """Background task that checks dependencies into a cached snapshot"""
+
+    def __init__(self, interval: float = HEALTH_INTERVAL):
+        self.interval = interval
+        self.state: Dict = {
+            "status": "starting",
+            "components": {
+                "api": "operational",
+                "database": "unknown",
+                "cache": "unknown",
+                "queue": "unknown"
+            }
+        }
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the last probe found every component operational"""
+        return self.state["status"] == "healthy"
+
+    async def start(self):
+        """Run a first probe, then keep probing on the running loop"""
+        await self.probe()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the probe task"""
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def probe(self):
+        """Check every dependency and replace the snapshot"""
+        database, cache = await asyncio.gather(
+            self.check(asyncio.to_thread(self.ping_database)),
+            self.check(REDIS.ping())
+        )
+        components = {
+            "api": "operational",
+            "database": database,
+            "cache": cache,
+            "queue": self.check_queue(job_queue.workers)
+        }
+
+        # Handlers only read the snapshot, so swapping the whole dict in
+        # one assignment needs no lock on a single event loop
+        self.state = {
+            "status": "healthy" if all(v == "operational" for v in components.values()) else "degraded",
+            "components": components,
+            "checked_at": datetime.utcnow().isoformat()
+        }
+
+    async def check(self, ping: Awaitable) -> str:
+        """Run one dependency ping with a timeout"""
+        try:
+            await asyncio.wait_for(ping, timeout=HEALTH_TIMEOUT)
+            return "operational"
+        except Exception as e:
+            logger.warning("Health probe failed: %s", e)
+            return "down"
+
+    def ping_database(self):
+        """Round-trip a trivial query through the connection pool"""
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    def check_queue(self, workers: List[asyncio.Task]) -> str:
+        """Check that job workers are still running"""
+        if workers and not any(worker.done() for worker in workers):
+            return "operational"
+        return "down"
+
+    async def _run(self):
+        """Probe dependencies every interval"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.exception("Health probe loop failed: %s", e)
+
+# Shared health snapshot for the API process
+health_prober = HealthProber()
@@ -0,0 +1,25 @@
+import os
+import httpx
+import openai
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Connection pool shared by every service that talks to OpenAI, so
+# concurrent requests reuse keep-alive connections instead of opening
+# a pool (and TLS handshakes) per client
+SHARED_HTTPX = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=256, max_keepalive_connections=64),
+    timeout=httpx.Timeout(60.0, connect=5.0)
+)
+
+OPENAI = openai.AsyncOpenAI(
+    api_key=os.getenv("OPENAI_API_KEY"),
+    http_client=SHARED_HTTPX
+)
+
+async def close_clients():
+    """Close shared HTTP clients"""
+    await OPENAI.close()
+    await SHARED_HTTPX.aclose()
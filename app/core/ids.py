@@ -0,0 +1,21 @@
+import os
+import time
+import uuid
+
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUID (version 7)"""
+    if hasattr(uuid, "uuid7"):
+        return uuid.uuid7()
+    
+    # RFC 9562 layout: 48-bit Unix millisecond timestamp, version,
+    # 12 random bits, variant, 62 random bits
+    timestamp_ms = time.time_ns() // 1_000_000
+    random_bits = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+        | 0x7 << 76
+        | ((random_bits >> 62) & 0xFFF) << 64
+        | 0b10 << 62
+        | random_bits & ((1 << 62) - 1)
+    )
+    return uuid.UUID(int=value)
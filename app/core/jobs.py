@@ -0,0 +1,160 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import cachetools
+from datetime import datetime
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs stay readable for this long so clients can fetch the
+# result, then are dropped along with their result and listeners
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "3600"))
+JOB_RESULT_MAXSIZE = 10000
+
+class JobState:
+    """State of a long-running job submitted through the API"""
+
+    def __init__(self, request_id: str, kind: str):
+        self.request_id = request_id
+        self.kind = kind
+        self.status = "queued"
+        self.current_step: Optional[str] = None
+        self.progress = 0
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.updated_at = self.created_at
+        self.listeners: List[asyncio.Queue] = []
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not"""
+        return self.status in ("completed", "failed")
+
+    def set_step(self, step: str, progress: int):
+        """Record the pipeline step the job is currently running"""
+        self.current_step = step
+        self.progress = progress
+        self.updated_at = datetime.utcnow()
+        self.publish("progress", {"step": step, "pct": progress})
+
+    def finish(self, result: Dict):
+        """Mark the job as completed"""
+        self.status = "completed"
+        self.progress = 100
+        self.result = result
+        self.updated_at = datetime.utcnow()
+        self.publish("completed", self.to_dict())
+
+    def fail(self, error: str):
+        """Mark the job as failed"""
+        self.status = "failed"
+        self.error = error
+        self.updated_at = datetime.utcnow()
+        self.publish("failed", self.to_dict())
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a queue that receives job events"""
+        queue = asyncio.Queue()
+        self.listeners.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Stop delivering job events to a queue"""
+        if queue in self.listeners:
+            self.listeners.remove(queue)
+
+    def publish(self, event: str, data: Dict):
+        """Deliver an event to every subscriber"""
+        for queue in self.listeners:
+            queue.put_nowait((event, data))
+
+    def to_dict(self) -> Dict:
+        """Serialize job state for API responses"""
+        return {
+            "request_id": self.request_id,
+            "kind": self.kind,
+            "status": self.status,
+            "current_step": self.current_step,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat()
+        }
+
+class JobQueue:
+    """Bounded job queue drained by a fixed number of worker tasks"""
+
+    def __init__(self, maxsize: int = 100, workers: int = 2):
+        self.maxsize = maxsize
+        self.worker_count = workers
+        # Queued and running jobs; finished ones move to a TTL cache
+        self.jobs: Dict[str, JobState] = {}
+        self.finished = cachetools.TTLCache(maxsize=JOB_RESULT_MAXSIZE, ttl=JOB_RESULT_TTL)
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+
+    async def start(self):
+        """Create the queue and start worker tasks on the running loop"""
+        self.queue = asyncio.Queue(maxsize=self.maxsize)
+        self.workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(self.worker_count)
+        ]
+
+    async def stop(self):
+        """Cancel worker tasks"""
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def submit(self, kind: str, func: Callable[..., Awaitable[Dict]], *args: Any) -> JobState:
+        """Register a job and enqueue it, waiting while the queue is full"""
+        job = JobState(uuid4().hex, kind)
+        self.jobs[job.request_id] = job
+        await self.queue.put((job, func, args))
+        return job
+
+    def get(self, request_id: str) -> Optional[JobState]:
+        """Get job state by request ID"""
+        job = self.jobs.get(request_id)
+        if job is None:
+            job = self.finished.get(request_id)
+        return job
+
+    async def events(self, job: JobState) -> AsyncIterator[Tuple[str, Dict]]:
+        """Yield job events until the job finishes"""
+        queue = job.subscribe()
+        try:
+            # Subscribe before taking the snapshot so no event is missed
+            yield "status", job.to_dict()
+            if job.done:
+                return
+            while True:
+                event, data = await queue.get()
+                yield event, data
+                if event in ("completed", "failed"):
+                    return
+        finally:
+            job.unsubscribe(queue)
+
+    async def _worker(self):
+        """Run queued jobs one at a time"""
+        while True:
+            job, func, args = await self.queue.get()
+            try:
+                job.status = "processing"
+                job.finish(await func(job, *args))
+            except Exception as e:
+                logger.exception("Job %s failed: %s", job.request_id, e)
+                job.fail(str(e))
+            finally:
+                self.finished[job.request_id] = self.jobs.pop(job.request_id)
+                self.queue.task_done()
+
+# Shared job registry for the API process
+job_queue = JobQueue()
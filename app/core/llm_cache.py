@@ -0,0 +1,178 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import threading
+import cachetools
+import numpy as np
+import redis
+from dotenv import load_dotenv
+from app.core.http import OPENAI as openai_client
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Responses are stored in Redis under a hash of model, system prompt and
+# user prompt. With the semantic tier enabled, a miss on the exact hash
+# falls back to the most similar earlier prompt for the same model and
+# system prompt, compared by embedding cosine similarity.
+class LLMCache:
+    """Two-tier response cache for chat completions"""
+    
+    def __init__(
+        self,
+        redis_url: str,
+        ttl: int,
+        semantic: bool = False,
+        threshold: float = 0.92,
+        embedding_model: str = "text-embedding-3-small",
+        index_size: int = 1000
+    ):
+        self.redis = redis.Redis.from_url(redis_url)
+        self.ttl = ttl
+        self.semantic = semantic
+        self.threshold = threshold
+        self.embedding_model = embedding_model
+        self.index_size = index_size
+        self.openai_client = openai_client if semantic else None
+        
+        # Embeddings of cached prompts per (model, system prompt), kept
+        # as a normalized matrix so a lookup is a single matrix product
+        self.index: Dict[str, Tuple[List[str], np.ndarray]] = {}
+        self.index_lock = threading.Lock()
+        
+        # Embeddings computed on a miss, reused when the response is stored
+        self.pending = cachetools.LRUCache(maxsize=256)
+    
+    def cached_call(self, model: str, decode: Callable[[str], Any]) -> Callable:
+        """Cache an async method(system_prompt, prompt) returning response text
+        
+        The wrapped method returns decode(text). A response is stored only
+        once it decodes, and a cached response that fails to decode is
+        evicted and requested again.
+        """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            async def wrapper(owner, system_prompt: str, prompt: str, *args, **kwargs):
+                key, cached = await self.lookup_entry(model, system_prompt, prompt)
+                if cached is not None:
+                    try:
+                        return decode(cached)
+                    except Exception as e:
+                        logger.warning("Evicting undecodable LLM cache entry: %s", e)
+                        await asyncio.to_thread(self.evict, key)
+                response = await func(owner, system_prompt, prompt, *args, **kwargs)
+                result = decode(response)
+                await asyncio.to_thread(self.store, model, system_prompt, prompt, response)
+                return result
+            return wrapper
+        return decorator
+    
+    async def lookup(self, model: str, system_prompt: str, prompt: str) -> Optional[str]:
+        """Get a cached response, or None on a miss"""
+        return (await self.lookup_entry(model, system_prompt, prompt))[1]
+    
+    async def lookup_entry(self, model: str, system_prompt: str, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+        """Get the key and text of a cached response, or None for both on a miss"""
+        try:
+            key = self.make_key(model, system_prompt, prompt)
+            cached = await asyncio.to_thread(self.redis.get, key)
+            if cached is None and self.semantic:
+                key = await self.find_similar(
+                    self.make_namespace(model, system_prompt),
+                    key,
+                    prompt
+                )
+                if key is not None:
+                    cached = await asyncio.to_thread(self.redis.get, key)
+            if cached is None:
+                return None, None
+            return key, cached.decode("utf-8")
+        except Exception as e:
+            logger.warning("Failed to read LLM cache: %s", e)
+            return None, None
+    
+    def store(self, model: str, system_prompt: str, prompt: str, response: str):
+        """Cache a response"""
+        try:
+            key = self.make_key(model, system_prompt, prompt)
+            self.redis.set(key, response, ex=self.ttl)
+            if self.semantic:
+                self.add_to_index(
+                    self.make_namespace(model, system_prompt),
+                    key,
+                    self.pending.pop(key, None)
+                )
+        except Exception as e:
+            logger.warning("Failed to write LLM cache: %s", e)
+    
+    def evict(self, key: str):
+        """Drop a cached response"""
+        try:
+            self.redis.delete(key)
+        except Exception as e:
+            logger.warning("Failed to evict LLM cache entry: %s", e)
+    
+    def make_key(self, model: str, system_prompt: str, prompt: str) -> str:
+        """Build the exact-match cache key"""
+        digest = hashlib.sha256(
+            "\x00".join((model, system_prompt, prompt)).encode("utf-8")
+        ).hexdigest()
+        return f"drama:llm:{digest}"
+    
+    def make_namespace(self, model: str, system_prompt: str) -> str:
+        """Group prompts that may share a response"""
+        return hashlib.sha256(
+            "\x00".join((model, system_prompt)).encode("utf-8")
+        ).hexdigest()
+    
+    async def embed(self, prompt: str) -> np.ndarray:
+        """Get the normalized embedding of a prompt"""
+        response = await self.openai_client.embeddings.create(
+            model=self.embedding_model,
+            input=prompt
+        )
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    async def find_similar(self, namespace: str, key: str, prompt: str) -> Optional[str]:
+        """Find the key of the most similar cached prompt above the threshold"""
+        vector = await self.embed(prompt)
+        self.pending[key] = vector
+        
+        with self.index_lock:
+            if namespace not in self.index:
+                return None
+            keys, matrix = self.index[namespace]
+            scores = matrix @ vector
+        
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return keys[best]
+        return None
+    
+    def add_to_index(self, namespace: str, key: str, vector: Optional[np.ndarray]):
+        """Add a cached prompt to the similarity index"""
+        if vector is None:
+            return
+        
+        with self.index_lock:
+            if namespace in self.index:
+                keys, matrix = self.index[namespace]
+                keys = (keys + [key])[-self.index_size:]
+                matrix = np.vstack([matrix, vector])[-self.index_size:]
+            else:
+                keys, matrix = [key], vector[np.newaxis, :]
+            self.index[namespace] = (keys, matrix)
+
+# Shared cache for every generator in the process
+llm_cache = LLMCache(
+    redis_url=os.getenv("REDIS_URL", "redis://localhost:6379"),
+    ttl=int(os.getenv("LLM_CACHE_TTL", "604800")),
+    semantic=os.getenv("LLM_SEMANTIC_CACHE", "false").lower() == "true",
+    threshold=float(os.getenv("LLM_SEMANTIC_THRESHOLD", "0.92"))
+)
@@ -0,0 +1,28 @@
+import os
+import sqlite3
+import orjson
+import zstandard
+
+# Level 3 keeps compression cheap while shrinking generated JSON 4-6x
+_COMPRESSION_LEVEL = 3
+
+def open_sqlite(path: str) -> sqlite3.Connection:
+    """Open a SQLite database in WAL mode for local memory stores"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    # Autocommit; WAL lets readers proceed while a write is in progress,
+    # and NORMAL sync is durable across application crashes
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+def pack(data) -> bytes:
+    """Serialize data to a compressed JSON blob"""
+    return zstandard.ZstdCompressor(level=_COMPRESSION_LEVEL).compress(orjson.dumps(data))
+
+def unpack(blob: bytes):
+    """Deserialize a compressed JSON blob"""
+    return orjson.loads(zstandard.ZstdDecompressor().decompress(blob))
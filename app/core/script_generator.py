@@ -1,25 +1,143 @@
 from typing import Dict, List, Optional
-import openai
+import asyncio
+import functools
+import hashlib
 import json
+import orjson
 import logging
-from datetime import datetime
+import cachetools
+import threading
 import os
+import msgspec
 from dotenv import load_dotenv
+from app.core.http import OPENAI as openai_client
+from app.core.ids import uuid7
+from app.core.llm_cache import llm_cache
+from app.core.local_store import open_sqlite, pack, unpack
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Batch statuses after which a batch will make no more progress
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Scripts are requested in JSON mode, which base gpt-4 does not support
+SCRIPT_MODEL = os.getenv("SCRIPT_MODEL", "gpt-4o")
+
+# Output budget for an episode script
+SCRIPT_MAX_TOKENS = int(os.getenv("SCRIPT_MAX_TOKENS", "1600"))
+
+# Script structure returned by the model. Decoding into these structs
+# parses and validates in one pass; strict=False accepts numbers sent
+# as strings.
+class Dialogue(msgspec.Struct):
+    character: str
+    text: str
+    emotion: str
+
+class Scene(msgspec.Struct):
+    scene_number: int
+    location: str
+    time: str
+    dialogues: List[Dialogue]
+
+class PlotProgressions(msgspec.Struct):
+    main_plot: str
+    sub_plots: List[str]
+
+class Script(msgspec.Struct):
+    episode_title: str
+    summary: str
+    scenes: List[Scene]
+    character_developments: Dict[str, str]
+    plot_progressions: PlotProgressions
+    cliffhanger: str
+
+_SCRIPT_DECODER = msgspec.json.Decoder(Script, strict=False)
+
+def episode_digest(episode: Dict) -> str:
+    """Fingerprint a stored episode for the running summary cache"""
+    return hashlib.blake2b(
+        orjson.dumps(episode, option=orjson.OPT_SORT_KEYS),
+        digest_size=16
+    ).hexdigest()
+
+def decode_script(content: str) -> Dict:
+    """Parse and validate a generated script"""
+    return msgspec.to_builtins(_SCRIPT_DECODER.decode(content))
+
+# Static instructions and the response format go first, then series
+# metadata, then per-episode context, so episodes of a series share a
+# long prompt prefix that OpenAI can serve from its prompt cache
+_SCRIPT_INSTRUCTIONS = """
+        Create a drama script for the episode described at the end of this prompt.
+        
+        Requirements:
+        1. Maintain character consistency
+        2. Advance the main plot
+        3. Include character development
+        4. Create engaging dialogue
+        5. End with a cliffhanger
+        6. Duration: 10 minutes
+        
+        Format the response as a JSON object with the following structure:
+        {
+            "episode_title": "string",
+            "summary": "string",
+            "scenes": [
+                {
+                    "scene_number": integer,
+                    "location": "string",
+                    "time": "string",
+                    "dialogues": [
+                        {
+                            "character": "string",
+                            "text": "string",
+                            "emotion": "string"
+                        }
+                    ]
+                }
+            ],
+            "character_developments": {
+                "character_name": "development description"
+            },
+            "plot_progressions": {
+                "main_plot": "progression description",
+                "sub_plots": ["progression description"]
+            },
+            "cliffhanger": "string"
+        }
+        """
+
+_SERIES_HEADER = """
+        Series Information:
+        - Title: {title}
+        - Genre: {genre}
+        - Total Episodes: {total_episodes}
+        """
+
+@functools.lru_cache(maxsize=1024)
+def script_prompt_prefix(title: str, genre: str, total_episodes: int) -> str:
+    """Build the part of the script prompt shared by every episode of a series"""
+    return _SCRIPT_INSTRUCTIONS + _SERIES_HEADER.format(
+        title=title,
+        genre=genre,
+        total_episodes=total_episodes
+    )
+
 class ScriptGenerator:
     """Script generation system for AI drama series"""
     
     def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.openai_client = openai_client
         self.story_memory = StoryMemory()
         self.character_tracker = CharacterTracker()
+        
+        # Running summary of each series' episodes, extended one episode
+        # at a time instead of re-summarizing the whole history
+        self.summary_cache = cachetools.LRUCache(maxsize=1024)
     
     def create_new_series(self, series_config: Dict) -> Dict:
         """Create a new drama series"""
@@ -55,17 +173,19 @@ class ScriptGenerator:
             return series_data
             
         except Exception as e:
-            logger.error(f"Failed to create new series: {str(e)}")
+            logger.error("Failed to create new series: %s", e)
             raise
     
-    def generate_episode_script(self, series_id: str, episode_number: int) -> Dict:
+    async def generate_episode_script(self, series_id: str, episode_number: int) -> Dict:
         """Generate script for a specific episode"""
         try:
-            # Load series information
-            series = self.story_memory.get_series(series_id)
+            # Load series information; StoryMemory is blocking SQLite,
+            # so it runs off the event loop
+            series = await asyncio.to_thread(self.story_memory.get_series, series_id)
             
             # Get previous episodes
-            previous_episodes = self.story_memory.get_previous_episodes(
+            previous_episodes = await asyncio.to_thread(
+                self.story_memory.get_previous_episodes,
                 series_id,
                 episode_number
             )
@@ -78,28 +198,129 @@ class ScriptGenerator:
             )
             
             # Generate script
-            script = self.generate_script_with_context(context)
+            script = await self.generate_script_with_context(context)
             
             # Validate continuity
             self.validate_continuity(script, context)
             
             # Update story memory
-            self.story_memory.update_episode(series_id, episode_number, script)
+            await asyncio.to_thread(self.story_memory.update_episode, series_id, episode_number, script)
+            
+            # Extend the running summary with the new episode
+            self.record_episode_summary(series_id, previous_episodes, script)
             
             return script
             
         except Exception as e:
-            logger.error(f"Failed to generate episode script: {str(e)}")
+            logger.error("Failed to generate episode script: %s", e)
             raise
     
+    async def generate_all_episodes_batch(self, series_id: str, poll_interval: int = 60) -> Dict[int, Dict]:
+        """Generate scripts for every episode of a series with the Batch API"""
+        try:
+            # Submit one request per episode as a single batch job
+            batch_id = await self.submit_episode_batch(series_id)
+            
+            # Wait for the batch to finish
+            batch = await self.wait_for_batch(batch_id, poll_interval)
+            if batch.status != "completed":
+                raise RuntimeError(f"Episode batch {batch_id} ended with status {batch.status}")
+            
+            # Collect and store the generated scripts
+            output = (await self.openai_client.files.content(batch.output_file_id)).text
+            scripts = {}
+            for line in output.splitlines():
+                result = json.loads(line)
+                episode_number = int(result["custom_id"].split("-", 1)[1])
+                try:
+                    if result["error"] or result["response"]["status_code"] != 200:
+                        raise ValueError(result["error"] or result["response"]["body"])
+                    
+                    content = result["response"]["body"]["choices"][0]["message"]["content"]
+                    scripts[episode_number] = self.decode_script(content)
+                    
+                except Exception as e:
+                    logger.error("Failed to generate script for episode %s: %s", episode_number, e)
+            
+            # Store every generated script in one transaction
+            await asyncio.to_thread(self.story_memory.update_episodes, series_id, scripts)
+            
+            return scripts
+            
+        except Exception as e:
+            logger.error("Failed to generate episode batch: %s", e)
+            raise
+    
+    async def submit_episode_batch(self, series_id: str) -> str:
+        """Submit script requests for every episode as one batch job"""
+        series = await asyncio.to_thread(self.story_memory.get_series, series_id)
+        
+        # Episodes in a batch are generated together, so each context is
+        # built from the outlines and whatever episodes already exist
+        requests = []
+        for episode_number in range(1, series["config"]["total_episodes"] + 1):
+            previous_episodes = await asyncio.to_thread(
+                self.story_memory.get_previous_episodes,
+                series_id,
+                episode_number
+            )
+            context = self.build_episode_context(
+                series,
+                episode_number,
+                previous_episodes
+            )
+            requests.append(json.dumps({
+                "custom_id": f"ep-{episode_number}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": SCRIPT_MODEL,
+                    "messages": [
+                        {"role": "system", "content": "You are a professional drama script writer."},
+                        {"role": "user", "content": self.create_script_prompt(context)}
+                    ],
+                    "temperature": 0.7,
+                    "max_tokens": SCRIPT_MAX_TOKENS,
+                    "response_format": {"type": "json_object"},
+                    "prompt_cache_key": series_id
+                }
+            }))
+        
+        batch_file = await self.openai_client.files.create(
+            file=(f"episodes_{series_id}.jsonl", "\n".join(requests).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"series_id": series_id}
+        )
+        
+        logger.info("Submitted episode batch %s for series %s", batch.id, series_id)
+        return batch.id
+    
+    async def wait_for_batch(self, batch_id: str, poll_interval: int = 60):
+        """Poll a batch job until it reaches a final status"""
+        while True:
+            batch = await self.openai_client.batches.retrieve(batch_id)
+            if batch.status in BATCH_FINAL_STATUSES:
+                return batch
+            await asyncio.sleep(poll_interval)
+    
     def build_episode_context(self, series: Dict, episode_num: int, previous: List) -> Dict:
         """Build context for episode generation"""
         return {
+            "series_id": series["series_id"],
             "series_info": series["config"],
             "overall_plot": series["plot"],
             "current_episode_outline": series["episode_outlines"][episode_num - 1],
             "character_states": self.character_tracker.get_current_states(series["series_id"]),
-            "previous_events": self.summarize_previous_events(previous),
+            "previous_events": self.get_previous_events_summary(
+                series["series_id"],
+                episode_num,
+                previous
+            ),
             "unresolved_plots": self.get_unresolved_plots(previous),
             "relationships": self.character_tracker.get_relationship_status(series["series_id"]),
             "story_progress": self.calculate_story_progress(
@@ -108,37 +329,86 @@ class ScriptGenerator:
             )
         }
     
-    def generate_script_with_context(self, context: Dict) -> Dict:
-        """Generate script using GPT-4 with context"""
+    def get_previous_events_summary(self, series_id: str, episode_num: int, previous: List) -> str:
+        """Summarize events before an episode, reusing the summary of earlier episodes"""
+        digests = [episode_digest(episode) for episode in previous]
+        cached = self.summary_cache.get(series_id)
+        
+        # Reuse the cached summary only while the episodes it covers are
+        # unchanged and come first; a regenerated or missing episode
+        # changes the digests and the summary is rebuilt
+        if cached is not None and digests[:len(cached["digests"])] == cached["digests"]:
+            covered = len(cached["digests"])
+            summary = cached["summary"]
+        else:
+            covered = 0
+            summary = ""
+        
+        # Summarize only the episodes not yet covered
+        if covered < len(previous):
+            delta = self.summarize_previous_events(previous[covered:])
+            summary = "\n".join(filter(None, [summary, delta]))
+            self.summary_cache[series_id] = {"digests": digests, "summary": summary}
+        
+        return summary
+    
+    def record_episode_summary(self, series_id: str, previous: List, script: Dict):
+        """Add a newly generated episode to the running series summary"""
+        cached = self.summary_cache.get(series_id)
+        if cached is None or cached["digests"] != [episode_digest(episode) for episode in previous]:
+            return
+        
+        delta = self.summarize_previous_events([script])
+        self.summary_cache[series_id] = {
+            "digests": cached["digests"] + [episode_digest(script)],
+            "summary": "\n".join(filter(None, [cached["summary"], delta]))
+        }
+    
+    async def generate_script_with_context(self, context: Dict) -> Dict:
+        """Generate script with context"""
         try:
             prompt = self.create_script_prompt(context)
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional drama script writer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
+            return await self.complete(
+                "You are a professional drama script writer.",
+                prompt,
+                cache_key=context["series_id"]
             )
             
-            script = json.loads(response.choices[0].message.content)
-            return self.validate_and_format_script(script)
-            
         except Exception as e:
-            logger.error(f"Failed to generate script: {str(e)}")
+            logger.error("Failed to generate script: %s", e)
             raise
     
+    @llm_cache.cached_call(model=SCRIPT_MODEL, decode=decode_script)
+    async def complete(self, system_prompt: str, prompt: str, cache_key: Optional[str] = None) -> str:
+        """Run a chat completion and return the response text"""
+        response = await self.openai_client.chat.completions.create(
+            model=SCRIPT_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=SCRIPT_MAX_TOKENS,
+            response_format={"type": "json_object"},
+            extra_body={"prompt_cache_key": cache_key} if cache_key else None
+        )
+        return response.choices[0].message.content
+    
     def create_script_prompt(self, context: Dict) -> str:
         """Create prompt for script generation"""
-        return f"""
-        Create a drama script for episode {context['current_episode_outline']['episode_number']}.
+        return script_prompt_prefix(
+            context['series_info']['title'],
+            context['series_info']['genre'],
+            context['series_info']['total_episodes']
+        ) + f"""
+        Episode Number: {context['current_episode_outline']['episode_number']}
         
-        Series Information:
-        - Title: {context['series_info']['title']}
-        - Genre: {context['series_info']['genre']}
-        - Total Episodes: {context['series_info']['total_episodes']}
+        Current Episode Outline:
+        {orjson.dumps(context['current_episode_outline'], option=orjson.OPT_INDENT_2).decode()}
+        
+        Character States:
+        {orjson.dumps(context['character_states'], option=orjson.OPT_INDENT_2).decode()}
         
         Previous Events:
         {context['previous_events']}
@@ -146,63 +416,12 @@ class ScriptGenerator:
         Unresolved Plots:
         {context['unresolved_plots']}
         
-        Character States:
-        {json.dumps(context['character_states'], indent=2)}
-        
-        Current Episode Outline:
-        {json.dumps(context['current_episode_outline'], indent=2)}
-        
         Story Progress: {context['story_progress']}%
-        
-        Requirements:
-        1. Maintain character consistency
-        2. Advance the main plot
-        3. Include character development
-        4. Create engaging dialogue
-        5. End with a cliffhanger
-        6. Duration: 10 minutes
-        
-        Format the response as a JSON object with the following structure:
-        {{
-            "episode_title": "string",
-            "summary": "string",
-            "scenes": [
-                {{
-                    "scene_number": integer,
-                    "location": "string",
-                    "time": "string",
-                    "dialogues": [
-                        {{
-                            "character": "string",
-                            "text": "string",
-                            "emotion": "string"
-                        }}
-                    ]
-                }}
-            ],
-            "character_developments": {{
-                "character_name": "development description"
-            }},
-            "plot_progressions": {{
-                "main_plot": "progression description",
-                "sub_plots": ["progression description"]
-            }},
-            "cliffhanger": "string"
-        }}
         """
     
-    def validate_and_format_script(self, script: Dict) -> Dict:
-        """Validate and format the generated script"""
-        required_fields = [
-            "episode_title", "summary", "scenes",
-            "character_developments", "plot_progressions", "cliffhanger"
-        ]
-        
-        for field in required_fields:
-            if field not in script:
-                raise ValueError(f"Missing required field: {field}")
-        
-        return script
+    def decode_script(self, content: str) -> Dict:
+        """Parse and validate a generated script"""
+        return decode_script(content)
     
     def validate_continuity(self, script: Dict, context: Dict) -> bool:
         """Validate script continuity"""
@@ -211,7 +430,8 @@ class ScriptGenerator:
     
     def generate_uuid(self) -> str:
         """Generate unique ID for series"""
-        return datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        # Time-ordered, so new series IDs stay close together in indexes
+        return str(uuid7())
     
     def calculate_story_progress(self, current_episode: int, total_episodes: int) -> float:
         """Calculate story progress percentage"""
@@ -221,24 +441,69 @@ class StoryMemory:
     """Story memory system for maintaining continuity"""
     
     def __init__(self):
-        # Initialize database connection
-        pass
+        # Series and episodes are stored as compressed JSON blobs
+        self.conn = open_sqlite(os.getenv("STORY_DB_PATH", "output/story.db"))
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS series ("
+                "series_id TEXT PRIMARY KEY, blob BLOB NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS episodes ("
+                "series_id TEXT, episode_number INTEGER, blob BLOB NOT NULL, "
+                "PRIMARY KEY (series_id, episode_number))"
+            )
     
     def save_series(self, series_data: Dict):
         """Save series data to database"""
-        pass
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO series (series_id, blob) VALUES (?, ?)",
+                (series_data["series_id"], pack(series_data))
+            )
     
     def get_series(self, series_id: str) -> Dict:
         """Get series data from database"""
-        pass
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT blob FROM series WHERE series_id = ?",
+                (series_id,)
+            ).fetchone()
+        return unpack(row[0]) if row else None
     
     def get_previous_episodes(self, series_id: str, current_episode: int) -> List[Dict]:
         """Get previous episodes data"""
-        pass
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT blob FROM episodes WHERE series_id = ? AND episode_number < ? "
+                "ORDER BY episode_number",
+                (series_id, current_episode)
+            ).fetchall()
+        return [unpack(row[0]) for row in rows]
     
     def update_episode(self, series_id: str, episode_number: int, script: Dict):
         """Update episode data"""
-        pass
+        self.update_episodes(series_id, {episode_number: script})
+    
+    def update_episodes(self, series_id: str, scripts: Dict[int, Dict]):
+        """Update several episodes in one transaction"""
+        rows = [
+            (series_id, episode_number, pack(script))
+            for episode_number, script in scripts.items()
+        ]
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO episodes (series_id, episode_number, blob) "
+                    "VALUES (?, ?, ?)",
+                    rows
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
 
 class CharacterTracker:
     """Character tracking system"""
@@ -1,62 +1,292 @@
-from typing import Dict, List, Optional
-import openai
-import json
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import functools
+import hashlib
+import orjson
+import ijson
+import msgspec
+import struct
+import threading
+import time
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter
 from datetime import datetime
 import os
+import tempfile
+from uuid import uuid4
 from dotenv import load_dotenv
 import moviepy.editor as mp
 from elevenlabs import generate, set_api_key
 import ffmpeg
+from app.core.http import OPENAI as openai_client
+from app.core.ids import uuid7
+from app.core.llm_cache import llm_cache
+from app.core.local_store import open_sqlite, pack, unpack
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrent ElevenLabs requests per episode; keep below the plan's
+# concurrency limit
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "16"))
+
+# Scene encoding is CPU-bound, so scenes render in separate processes
+SCENE_WORKERS = int(os.getenv("SCENE_WORKERS", str(os.cpu_count() or 1)))
+
+# Worker processes shared by every episode; started on first use and
+# shut down with the application
+SCENE_POOL = ProcessPoolExecutor(max_workers=SCENE_WORKERS)
+
+# Rendered scene clips; all share one format so the final video can be
+# joined without re-encoding
+SCENE_DIR = os.getenv("SCENE_DIR", "output/scenes")
+SCENE_RESOLUTION = os.getenv("SCENE_RESOLUTION", "1280x720")
+SCENE_FPS = 24
+SCENE_SAMPLE_RATE = 44100
+
+# Seconds a scene without dialogue stays on screen
+SILENT_SCENE_DURATION = 3.0
+
+# Generated dialogue audio is stored here by content hash, so repeated
+# lines are synthesized once and shared across scenes and episodes
+AUDIO_DIR = os.getenv("AUDIO_DIR", "output/audio")
+AUDIO_CACHE_TTL = int(os.getenv("AUDIO_CACHE_TTL", str(30 * 24 * 3600)))
+
+# ElevenLabs model used for dialogue
+TTS_MODEL = "eleven_monolingual_v1"
+
+# Streamed audio arrives in small chunks; a large write buffer turns them
+# into a few large write() calls per file
+AUDIO_WRITE_BUFFER = 1024 * 1024
+
+# Cross-fade transitions need MoviePy to decode and re-encode the whole
+# episode; without them scenes are joined by stream copy
+VIDEO_TRANSITIONS = os.getenv("VIDEO_TRANSITIONS", "false").lower() == "true"
+
+# Visual descriptions are structural transforms of the script, so they
+# use a smaller model than script writing
+VISUAL_MODEL = os.getenv("VISUAL_MODEL", "gpt-4o-mini")
+
+# Output budget for visual descriptions; the schemas typically fill
+# 300-900 tokens
+VISUAL_MAX_TOKENS = int(os.getenv("VISUAL_MAX_TOKENS", "900"))
+
+def strict_object(properties: Dict) -> Dict:
+    """Build a strict JSON schema object requiring every property"""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False
+    }
+
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+# Structured output schemas; strict mode needs a top-level object and
+# fixed keys, so lists are wrapped and name-keyed maps become arrays
+_SCENE_DESCRIPTION_SCHEMA = {
+    "name": "scene_descriptions",
+    "strict": True,
+    "schema": strict_object({
+        "scenes": {
+            "type": "array",
+            "items": strict_object({
+                "scene_number": {"type": "integer"},
+                "camera_angles": _STRING_LIST,
+                "lighting": _STRING,
+                "character_positions": {
+                    "type": "array",
+                    "items": strict_object({
+                        "character": _STRING,
+                        "position": _STRING
+                    })
+                },
+                "actions": _STRING_LIST,
+                "atmosphere": _STRING
+            })
+        }
+    })
+}
+
+_CHARACTER_VISUAL_SCHEMA = {
+    "name": "character_visuals",
+    "strict": True,
+    "schema": strict_object({
+        "characters": {
+            "type": "array",
+            "items": strict_object({
+                "name": _STRING,
+                "appearance": _STRING,
+                "clothing": _STRING,
+                "expressions": _STRING_LIST,
+                "body_language": _STRING,
+                "effects": _STRING_LIST
+            })
+        }
+    })
+}
+
+_BACKGROUND_VISUAL_SCHEMA = {
+    "name": "background_visuals",
+    "strict": True,
+    "schema": strict_object({
+        "backgrounds": {
+            "type": "array",
+            "items": strict_object({
+                "scene_number": {"type": "integer"},
+                "setting": _STRING,
+                "props": _STRING_LIST,
+                "lighting": _STRING,
+                "atmosphere": _STRING,
+                "effects": _STRING_LIST
+            })
+        }
+    })
+}
+
+# Static instructions and response formats go first and the episode data
+# last, so repeated requests share a long prompt prefix that OpenAI can
+# serve from its prompt cache
+_SCENE_DESCRIPTION_INSTRUCTIONS = """
+        Create detailed scene descriptions for the drama episode given at the end of this prompt.
+        
+        Requirements:
+        1. Create detailed descriptions for each scene
+        2. Include:
+           - Camera angles
+           - Lighting
+           - Character positioning
+           - Action sequences
+           - Emotional atmosphere
+        
+        Format the response as a JSON object:
+        {
+            "scenes": [
+                {
+                    "scene_number": integer,
+                    "camera_angles": ["string"],
+                    "lighting": "string",
+                    "character_positions": [
+                        {
+                            "character": "character name",
+                            "position": "position description"
+                        }
+                    ],
+                    "actions": ["string"],
+                    "atmosphere": "string"
+                }
+            ]
+        }
+        """
+
+_CHARACTER_VISUAL_INSTRUCTIONS = """
+        Create visual descriptions for the drama characters given at the end of this prompt.
+        
+        Requirements:
+        1. Create visual descriptions for each character
+        2. Include:
+           - Physical appearance
+           - Clothing style
+           - Facial expressions
+           - Body language
+           - Visual effects
+        
+        Format the response as a JSON object:
+        {
+            "characters": [
+                {
+                    "name": "character name",
+                    "appearance": "string",
+                    "clothing": "string",
+                    "expressions": ["string"],
+                    "body_language": "string",
+                    "effects": ["string"]
+                }
+            ]
+        }
+        """
+
+_BACKGROUND_VISUAL_INSTRUCTIONS = """
+        Create background visual descriptions for the drama scenes given at the end of this prompt.
+        
+        Requirements:
+        1. Create visual descriptions for each scene background
+        2. Include:
+           - Setting details
+           - Props
+           - Lighting
+           - Atmosphere
+           - Special effects
+        
+        Format the response as a JSON object:
+        {
+            "backgrounds": [
+                {
+                    "scene_number": integer,
+                    "setting": "string",
+                    "props": ["string"],
+                    "lighting": "string",
+                    "atmosphere": "string",
+                    "effects": ["string"]
+                }
+            ]
+        }
+        """
+
 class VideoGenerator:
     """Video generation system for AI drama series"""
     
     def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.openai_client = openai_client
         set_api_key(os.getenv("ELEVENLABS_API_KEY"))
         self.video_memory = VideoMemory()
     
-    def generate_episode_video(self, script: Dict, characters: Dict) -> Dict:
+    async def generate_episode_video(self, script: Dict, characters: Dict) -> Dict:
         """Generate video for an episode"""
         try:
-            # Generate scene descriptions
-            scene_descriptions = self.generate_scene_descriptions(script)
-            
-            # Generate character visuals
-            character_visuals = self.generate_character_visuals(characters)
-            
-            # Generate background visuals
-            background_visuals = self.generate_background_visuals(scene_descriptions)
-            
-            # Generate character voices
-            character_voices = self.generate_character_voices(script, characters)
-            
-            # Compose video scenes
-            video_scenes = self.compose_video_scenes(
-                scene_descriptions,
-                character_visuals,
-                background_visuals,
-                character_voices
+            # Visuals and voices depend only on the script, so they start
+            # right away and run while scene descriptions are generated
+            visuals = asyncio.gather(
+                self.generate_character_visuals(characters),
+                self.generate_background_visuals(script["scenes"])
+            )
+            voices = asyncio.ensure_future(asyncio.to_thread(
+                self.generate_character_voices,
+                script,
+                characters
+            ))
+            
+            # Scene descriptions stream in one scene at a time and each scene
+            # is sent to rendering as soon as it arrives
+            description_queue = asyncio.Queue()
+            producer = asyncio.ensure_future(
+                self.stream_scene_descriptions(script, description_queue)
             )
+            try:
+                video_scenes = await self.compose_video_scenes(
+                    description_queue,
+                    visuals,
+                    voices
+                )
+                await producer
+            finally:
+                for task in (producer, visuals, voices):
+                    task.cancel()
             
             # Add music and sound effects
-            audio_enhanced_scenes = self.add_audio_effects(video_scenes)
+            audio_enhanced_scenes = await asyncio.to_thread(self.add_audio_effects, video_scenes)
             
             # Render final video
-            final_video = self.render_final_video(audio_enhanced_scenes)
+            final_video = await asyncio.to_thread(self.render_final_video, audio_enhanced_scenes)
             
             # Prepare video data
             video_data = {
                 "video_path": final_video,
-                "duration": self.get_video_duration(final_video),
+                "duration": await asyncio.to_thread(self.get_video_duration, final_video),
                 "scenes": video_scenes,
                 "metadata": {
                     "title": script["episode_title"],
@@ -72,132 +302,254 @@ class VideoGenerator:
             return video_data
             
         except Exception as e:
-            logger.error(f"Failed to generate episode video: {str(e)}")
+            logger.error("Failed to generate episode video: %s", e)
             raise
     
-    def generate_scene_descriptions(self, script: Dict) -> List[Dict]:
-        """Generate detailed scene descriptions"""
+    async def stream_scene_descriptions(self, script: Dict, queue: asyncio.Queue):
+        """Generate scene descriptions, putting each scene on the queue as it completes"""
         try:
+            system_prompt = "You are a professional scene director."
             prompt = self.create_scene_description_prompt(script)
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional scene director."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            descriptions = json.loads(response.choices[0].message.content)
-            return self.validate_and_format_scene_descriptions(descriptions)
+            # Replay a cached response through the same parser; an entry
+            # that does not decode is evicted and generated again
+            key, content = await llm_cache.lookup_entry(VISUAL_MODEL, system_prompt, prompt)
+            if content is not None:
+                try:
+                    msgspec.json.decode(content)
+                except msgspec.DecodeError as e:
+                    logger.warning("Evicting undecodable scene descriptions: %s", e)
+                    await asyncio.to_thread(llm_cache.evict, key)
+                    content = None
+            if content is not None:
+                chunks = [content]
+            else:
+                stream = await self.openai_client.chat.completions.create(
+                    model=VISUAL_MODEL,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=VISUAL_MAX_TOKENS,
+                    response_format={"type": "json_schema", "json_schema": _SCENE_DESCRIPTION_SCHEMA},
+                    extra_body={"prompt_cache_key": "video-scene-descriptions"},
+                    stream=True
+                )
+                chunks = []
+            
+            async def deltas():
+                for chunk in chunks:
+                    yield chunk
+                if content is None:
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            chunks.append(chunk.choices[0].delta.content)
+                            yield chunk.choices[0].delta.content
+            
+            # Each element of "scenes" is emitted as soon as it is closed
+            scenes = ijson.sendable_list()
+            parser = ijson.items_coro(scenes, "scenes.item", use_float=True)
+            async for delta in deltas():
+                parser.send(delta.encode("utf-8"))
+                for scene in scenes:
+                    await queue.put(self.format_scene_description(scene))
+                del scenes[:]
+            parser.close()
+            
+            # Reached only once the whole response has parsed, so a
+            # truncated stream is never cached
+            if content is None:
+                await asyncio.to_thread(llm_cache.store, VISUAL_MODEL, system_prompt, prompt, "".join(chunks))
             
         except Exception as e:
-            logger.error(f"Failed to generate scene descriptions: {str(e)}")
+            logger.error("Failed to generate scene descriptions: %s", e)
             raise
+        
+        finally:
+            await queue.put(None)
     
-    def generate_character_visuals(self, characters: Dict) -> Dict:
+    async def generate_character_visuals(self, characters: Dict) -> Dict:
         """Generate character visual representations"""
         try:
             prompt = self.create_character_visual_prompt(characters)
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional character designer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
+            visuals = await self.complete(
+                "You are a professional character designer.",
+                prompt,
+                schema=_CHARACTER_VISUAL_SCHEMA,
+                cache_key="video-character-visuals"
             )
-            
-            visuals = json.loads(response.choices[0].message.content)
             return self.validate_and_format_character_visuals(visuals)
             
         except Exception as e:
-            logger.error(f"Failed to generate character visuals: {str(e)}")
+            logger.error("Failed to generate character visuals: %s", e)
             raise
     
-    def generate_background_visuals(self, scene_descriptions: List[Dict]) -> Dict:
+    async def generate_background_visuals(self, scenes: List[Dict]) -> Dict:
         """Generate background visuals for scenes"""
         try:
-            prompt = self.create_background_visual_prompt(scene_descriptions)
-            
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional set designer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
+            prompt = self.create_background_visual_prompt(scenes)
             
-            visuals = json.loads(response.choices[0].message.content)
+            visuals = await self.complete(
+                "You are a professional set designer.",
+                prompt,
+                schema=_BACKGROUND_VISUAL_SCHEMA,
+                cache_key="video-background-visuals"
+            )
             return self.validate_and_format_background_visuals(visuals)
             
         except Exception as e:
-            logger.error(f"Failed to generate background visuals: {str(e)}")
+            logger.error("Failed to generate background visuals: %s", e)
             raise
     
+    @llm_cache.cached_call(model=VISUAL_MODEL, decode=msgspec.json.decode)
+    async def complete(self, system_prompt: str, prompt: str, schema: Dict, cache_key: Optional[str] = None) -> str:
+        """Run a structured chat completion and return the response text"""
+        response = await self.openai_client.chat.completions.create(
+            model=VISUAL_MODEL,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=VISUAL_MAX_TOKENS,
+            response_format={"type": "json_schema", "json_schema": schema},
+            extra_body={"prompt_cache_key": cache_key} if cache_key else None
+        )
+        return response.choices[0].message.content
+    
     def generate_character_voices(self, script: Dict, characters: Dict) -> Dict:
         """Generate character voice lines"""
         try:
-            voice_lines = {}
+            lines = [
+                (
+                    dialogue["character"],
+                    dialogue["text"],
+                    dialogue["emotion"],
+                    self.get_voice_cache_path(
+                        characters[dialogue["character"]]["voice_id"],
+                        dialogue["text"]
+                    ),
+                    scene["scene_number"],
+                    line_number
+                )
+                for scene in script["scenes"]
+                for line_number, dialogue in enumerate(scene["dialogues"])
+            ]
+            
+            # Synthesize each distinct utterance once, skipping any that
+            # is already cached on disk
+            missing = {}
+            for character, text, _, path, _, _ in lines:
+                if path not in missing and not self.is_voice_cached(path):
+                    missing[path] = (text, characters[character]["voice_id"])
+            
+            # TTS requests are network-bound, so send them in parallel
+            os.makedirs(AUDIO_DIR, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=TTS_MAX_WORKERS) as executor:
+                list(executor.map(
+                    lambda item: self.synthesize_voice(item[1][0], item[1][1], item[0]),
+                    missing.items()
+                ))
             
-            for scene in script["scenes"]:
-                for dialogue in scene["dialogues"]:
-                    character = dialogue["character"]
-                    text = dialogue["text"]
-                    emotion = dialogue["emotion"]
-                    
-                    # Generate voice with appropriate emotion
-                    voice = generate(
-                        text=text,
-                        voice=characters[character]["voice_id"],
-                        model="eleven_monolingual_v1"
-                    )
-                    
-                    if character not in voice_lines:
-                        voice_lines[character] = []
-                    
-                    voice_lines[character].append({
-                        "text": text,
-                        "emotion": emotion,
-                        "audio": voice
-                    })
+            voice_lines = {}
+            for character, text, emotion, path, scene_number, line_number in lines:
+                voice_lines.setdefault(character, []).append({
+                    "text": text,
+                    "emotion": emotion,
+                    "path": path,
+                    "scene_number": scene_number,
+                    "line_number": line_number
+                })
             
             return voice_lines
             
         except Exception as e:
-            logger.error(f"Failed to generate character voices: {str(e)}")
+            logger.error("Failed to generate character voices: %s", e)
             raise
     
-    def compose_video_scenes(self, scene_descriptions: List[Dict], character_visuals: Dict, background_visuals: Dict, character_voices: Dict) -> List[Dict]:
-        """Compose video scenes from components"""
+    @retry(
+        stop=stop_after_attempt(4),
+        wait=wait_exponential_jitter(initial=1, max=10),
+        reraise=True
+    )
+    def synthesize_voice(self, text: str, voice_id: str, path: str) -> str:
+        """Generate speech for a single dialogue line and write it to path"""
+        audio = generate(
+            text=text,
+            voice=voice_id,
+            model=TTS_MODEL,
+            stream=True
+        )
+        
+        # Write chunks as they arrive instead of holding the clip in memory;
+        # the rename keeps other episodes from reading a partial file
+        tmp_path = f"{path}.{uuid4().hex}.tmp"
+        with open(tmp_path, "wb", buffering=AUDIO_WRITE_BUFFER) as audio_file:
+            for chunk in audio:
+                audio_file.write(chunk)
+        os.replace(tmp_path, path)
+        
+        return path
+    
+    def get_voice_cache_path(self, voice_id: str, text: str) -> str:
+        """Get the cache file path for an utterance"""
+        digest = hashlib.sha256(
+            "\x00".join((TTS_MODEL, voice_id, text)).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(AUDIO_DIR, f"{digest}.mp3")
+    
+    def is_voice_cached(self, path: str) -> bool:
+        """Check whether a cached utterance exists and has not expired"""
         try:
-            video_scenes = []
-            
-            for scene in scene_descriptions:
-                # Create scene video
-                scene_video = self.create_scene_video(
-                    scene,
-                    character_visuals,
-                    background_visuals,
-                    character_voices
-                )
-                
-                video_scenes.append({
+            return time.time() - os.path.getmtime(path) < AUDIO_CACHE_TTL
+        except FileNotFoundError:
+            return False
+    
+    async def compose_video_scenes(self, description_queue: asyncio.Queue, visuals: asyncio.Future, voices: asyncio.Future) -> List[Dict]:
+        """Compose video scenes from components as scene descriptions arrive"""
+        try:
+            loop = asyncio.get_running_loop()
+            character_visuals, background_visuals = await visuals
+            character_voices = await voices
+            
+            # Scenes are independent, so render them in parallel as they
+            # arrive; results are collected in scene order
+            scene_descriptions = []
+            futures = []
+            try:
+                while True:
+                    scene = await description_queue.get()
+                    if scene is None:
+                        break
+                    scene_descriptions.append(scene)
+                    futures.append(loop.run_in_executor(
+                        SCENE_POOL,
+                        create_scene_video,
+                        scene,
+                        character_visuals,
+                        background_visuals,
+                        character_voices
+                    ))
+                scene_videos = await asyncio.gather(*futures)
+            except BaseException:
+                # Drop this episode's scenes that have not started yet
+                for future in futures:
+                    future.cancel()
+                raise
+            
+            return [
+                {
                     "scene_number": scene["scene_number"],
                     "video": scene_video,
-                    "duration": self.get_video_duration(scene_video)
-                })
-            
-            return video_scenes
+                    "duration": await asyncio.to_thread(self.get_video_duration, scene_video)
+                }
+                for scene, scene_video in zip(scene_descriptions, scene_videos)
+            ]
             
         except Exception as e:
-            logger.error(f"Failed to compose video scenes: {str(e)}")
+            logger.error("Failed to compose video scenes: %s", e)
             raise
     
     def add_audio_effects(self, video_scenes: List[Dict]) -> List[Dict]:
@@ -217,15 +569,54 @@ class VideoGenerator:
             return enhanced_scenes
             
         except Exception as e:
-            logger.error(f"Failed to add audio effects: {str(e)}")
+            logger.error("Failed to add audio effects: %s", e)
             raise
     
     def render_final_video(self, scenes: List[Dict]) -> str:
         """Render final video from scenes"""
         try:
+            output_path = f"output/episode_{uuid7().hex}.mp4"
+            
+            if VIDEO_TRANSITIONS:
+                return self.render_with_transitions(scenes, output_path)
+            
+            # Scenes are rendered by this pipeline with the same codec and
+            # resolution, so the concat demuxer can join them without
+            # re-encoding
+            with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as concat_file:
+                for scene in scenes:
+                    video_path = os.path.abspath(scene["video"]).replace("'", "'\\''")
+                    concat_file.write(f"file '{video_path}'\n")
+            
+            try:
+                (
+                    ffmpeg
+                    .input(concat_file.name, format="concat", safe=0)
+                    .output(output_path, c="copy", movflags="+faststart")
+                    .run(overwrite_output=True, quiet=True)
+                )
+            finally:
+                os.remove(concat_file.name)
+            
+            return output_path
+            
+        except Exception as e:
+            logger.error("Failed to render final video: %s", e)
+            raise
+    
+    def render_with_transitions(self, scenes: List[Dict], output_path: str) -> str:
+        """Render final video with transitions, re-encoding every frame"""
+        # Open each scene once; a scene file used more than once shares
+        # its reader
+        clips = {}
+        try:
+            for scene in scenes:
+                if scene["video"] not in clips:
+                    clips[scene["video"]] = mp.VideoFileClip(scene["video"])
+            
             # Concatenate scene videos
             final_video = mp.concatenate_videoclips([
-                mp.VideoFileClip(scene["video"])
+                clips[scene["video"]]
                 for scene in scenes
             ])
             
@@ -233,173 +624,280 @@ class VideoGenerator:
             final_video = self.add_transitions(final_video)
             
             # Export final video
-            output_path = f"output/episode_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.mp4"
             final_video.write_videofile(output_path)
             
             return output_path
             
-        except Exception as e:
-            logger.error(f"Failed to render final video: {str(e)}")
-            raise
+        finally:
+            for clip in clips.values():
+                clip.close()
     
     def create_scene_description_prompt(self, script: Dict) -> str:
         """Create prompt for scene description generation"""
-        return f"""
-        Create detailed scene descriptions for a drama episode.
-        
+        return _SCENE_DESCRIPTION_INSTRUCTIONS + f"""
         Episode Title: {script['episode_title']}
         
         Scenes:
-        {json.dumps(script['scenes'], indent=2)}
-        
-        Requirements:
-        1. Create detailed descriptions for each scene
-        2. Include:
-           - Camera angles
-           - Lighting
-           - Character positioning
-           - Action sequences
-           - Emotional atmosphere
-        
-        Format the response as a JSON array:
-        [
-            {{
-                "scene_number": integer,
-                "camera_angles": ["string"],
-                "lighting": "string",
-                "character_positions": {{
-                    "character_name": "position description"
-                }},
-                "actions": ["string"],
-                "atmosphere": "string"
-            }}
-        ]
+        {orjson.dumps(script['scenes'], option=orjson.OPT_INDENT_2).decode()}
         """
     
     def create_character_visual_prompt(self, characters: Dict) -> str:
         """Create prompt for character visual generation"""
-        return f"""
-        Create visual descriptions for drama characters.
-        
+        return _CHARACTER_VISUAL_INSTRUCTIONS + f"""
         Characters:
-        {json.dumps(characters, indent=2)}
-        
-        Requirements:
-        1. Create visual descriptions for each character
-        2. Include:
-           - Physical appearance
-           - Clothing style
-           - Facial expressions
-           - Body language
-           - Visual effects
-        
-        Format the response as a JSON object:
-        {{
-            "character_name": {{
-                "appearance": "string",
-                "clothing": "string",
-                "expressions": ["string"],
-                "body_language": "string",
-                "effects": ["string"]
-            }}
-        }}
+        {orjson.dumps(characters, option=orjson.OPT_INDENT_2).decode()}
         """
     
-    def create_background_visual_prompt(self, scene_descriptions: List[Dict]) -> str:
+    def create_background_visual_prompt(self, scenes: List[Dict]) -> str:
         """Create prompt for background visual generation"""
-        return f"""
-        Create background visual descriptions for drama scenes.
-        
-        Scene Descriptions:
-        {json.dumps(scene_descriptions, indent=2)}
-        
-        Requirements:
-        1. Create visual descriptions for each scene background
-        2. Include:
-           - Setting details
-           - Props
-           - Lighting
-           - Atmosphere
-           - Special effects
-        
-        Format the response as a JSON object:
-        {{
-            "scene_number": {{
-                "setting": "string",
-                "props": ["string"],
-                "lighting": "string",
-                "atmosphere": "string",
-                "effects": ["string"]
-            }}
-        }}
+        return _BACKGROUND_VISUAL_INSTRUCTIONS + f"""
+        Scenes:
+        {orjson.dumps(scenes, option=orjson.OPT_INDENT_2).decode()}
         """
     
-    def validate_and_format_scene_descriptions(self, descriptions: List[Dict]) -> List[Dict]:
-        """Validate and format scene descriptions"""
-        required_fields = [
-            "scene_number", "camera_angles", "lighting",
-            "character_positions", "actions", "atmosphere"
-        ]
-        
-        for description in descriptions:
-            for field in required_fields:
-                if field not in description:
-                    raise ValueError(f"Missing required field in scene description: {field}")
-        
-        return descriptions
+    def format_scene_description(self, description: Dict) -> Dict:
+        """Format a scene description returned by the structured output schema"""
+        # The schema guarantees every field; only restore the
+        # character-keyed position map
+        return {
+            **description,
+            "character_positions": {
+                position["character"]: position["position"]
+                for position in description["character_positions"]
+            }
+        }
     
     def validate_and_format_character_visuals(self, visuals: Dict) -> Dict:
-        """Validate and format character visuals"""
-        required_fields = [
-            "appearance", "clothing", "expressions",
-            "body_language", "effects"
-        ]
-        
-        for character, visual in visuals.items():
-            for field in required_fields:
-                if field not in visual:
-                    raise ValueError(f"Missing required field in character visual: {field}")
-        
-        return visuals
+        """Format character visuals as a map keyed by character name"""
+        return {
+            visual["name"]: {
+                field: value
+                for field, value in visual.items()
+                if field != "name"
+            }
+            for visual in visuals["characters"]
+        }
     
     def validate_and_format_background_visuals(self, visuals: Dict) -> Dict:
-        """Validate and format background visuals"""
-        required_fields = [
-            "setting", "props", "lighting",
-            "atmosphere", "effects"
-        ]
-        
-        for scene, visual in visuals.items():
-            for field in required_fields:
-                if field not in visual:
-                    raise ValueError(f"Missing required field in background visual: {field}")
-        
-        return visuals
+        """Format background visuals as a map keyed by scene number"""
+        return {
+            str(visual["scene_number"]): {
+                field: value
+                for field, value in visual.items()
+                if field != "scene_number"
+            }
+            for visual in visuals["backgrounds"]
+        }
     
     def get_video_duration(self, video_path: str) -> float:
         """Get duration of a video file"""
         try:
-            probe = ffmpeg.probe(video_path)
-            return float(probe['streams'][0]['duration'])
+            # Keyed on mtime and size so a rewritten file is read again
+            stat = os.stat(video_path)
+            return read_video_duration(video_path, stat.st_mtime_ns, stat.st_size)
         except Exception as e:
-            logger.error(f"Failed to get video duration: {str(e)}")
+            logger.error("Failed to get video duration: %s", e)
             raise
 
+async def close_scene_pool():
+    """Shut down the scene rendering pool without blocking the event loop"""
+    await asyncio.to_thread(SCENE_POOL.shutdown, wait=True, cancel_futures=True)
+
+def create_scene_video(scene: Dict, character_visuals: Dict, background_visuals: Dict, character_voices: Dict) -> str:
+    """Render a single scene and return the path of its video file"""
+    # Runs in a worker process, so it takes only picklable arguments and
+    # the encoder is held to one thread to avoid oversubscribing cores
+    # across workers
+    scene_number = scene["scene_number"]
+    lines = sorted(
+        (
+            line
+            for voice_lines in character_voices.values()
+            for line in voice_lines
+            if line["scene_number"] == scene_number
+        ),
+        key=lambda line: line["line_number"]
+    )
+    
+    os.makedirs(SCENE_DIR, exist_ok=True)
+    output_path = os.path.join(SCENE_DIR, f"scene_{uuid7().hex}.mp4")
+    
+    # Dialogue played back to back; a scene without lines is held silent
+    if lines:
+        audio = ffmpeg.concat(
+            *[
+                ffmpeg.input(line["path"]).audio.filter(
+                    "aformat",
+                    sample_rates=SCENE_SAMPLE_RATE,
+                    channel_layouts="stereo"
+                )
+                for line in lines
+            ],
+            v=0,
+            a=1
+        )
+    else:
+        audio = ffmpeg.input(
+            f"anullsrc=r={SCENE_SAMPLE_RATE}:cl=stereo",
+            format="lavfi",
+            t=SILENT_SCENE_DURATION
+        ).audio
+    
+    # Storyboard frame built from the scene's set and character designs;
+    # drawtext reads it from a file so it needs no escaping
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as caption_file:
+        caption_file.write(build_storyboard(
+            scene,
+            character_visuals,
+            background_visuals.get(str(scene_number), {})
+        ))
+    
+    try:
+        video = (
+            ffmpeg
+            .input(f"color=c=black:s={SCENE_RESOLUTION}:r={SCENE_FPS}", format="lavfi")
+            .drawtext(
+                textfile=caption_file.name,
+                fontcolor="white",
+                fontsize=28,
+                line_spacing=8,
+                x=48,
+                y=48
+            )
+        )
+        
+        # Every scene shares codec, resolution and audio format so the
+        # episode can be joined by stream copy
+        (
+            ffmpeg
+            .output(
+                video,
+                audio,
+                output_path,
+                vcodec="libx264",
+                acodec="aac",
+                pix_fmt="yuv420p",
+                ar=SCENE_SAMPLE_RATE,
+                threads=1,
+                shortest=None
+            )
+            .run(overwrite_output=True, quiet=True)
+        )
+    finally:
+        os.remove(caption_file.name)
+    
+    return output_path
+
+def build_storyboard(scene: Dict, character_visuals: Dict, background: Dict) -> str:
+    """Describe a scene's set, lighting and on-screen characters as frame text"""
+    lines = [
+        background.get("setting", ""),
+        f"Props: {', '.join(background.get('props', []))}" if background.get("props") else "",
+        f"Lighting: {scene.get('lighting') or background.get('lighting', '')}",
+        f"Atmosphere: {scene.get('atmosphere') or background.get('atmosphere', '')}",
+        ""
+    ]
+    
+    # Each character placed in the scene, as designed for the series
+    for name, position in scene.get("character_positions", {}).items():
+        visual = character_visuals.get(name, {})
+        lines.append(f"{name} ({position}): {visual.get('appearance', '')}, wearing {visual.get('clothing', '')}")
+    
+    if scene.get("actions"):
+        lines.extend(["", *scene["actions"]])
+    
+    return "\n".join(lines).strip()
+
+@functools.lru_cache(maxsize=1024)
+def read_video_duration(video_path: str, mtime_ns: int, size: int) -> float:
+    """Read the duration of a video file"""
+    # MP4/MOV store the duration in the movie header, which is far
+    # cheaper to read than spawning ffprobe
+    if video_path.lower().endswith((".mp4", ".mov", ".m4v")):
+        duration = read_mvhd_duration(video_path, size)
+        if duration is not None:
+            return duration
+    
+    probe = ffmpeg.probe(video_path)
+    return float(probe['streams'][0]['duration'])
+
+def read_mvhd_duration(video_path: str, size: int) -> Optional[float]:
+    """Read the duration from the mvhd atom of an MP4/MOV file"""
+    with open(video_path, "rb") as video_file:
+        moov = find_atom(video_file, 0, size, b"moov")
+        if moov is None:
+            return None
+        mvhd = find_atom(video_file, moov[0], moov[1], b"mvhd")
+        if mvhd is None:
+            return None
+        
+        video_file.seek(mvhd[0])
+        version = video_file.read(4)[0]
+        if version == 1:
+            _, _, timescale, duration = struct.unpack(">QQIQ", video_file.read(28))
+        else:
+            _, _, timescale, duration = struct.unpack(">IIII", video_file.read(16))
+        
+        if not timescale:
+            return None
+        return duration / timescale
+
+def find_atom(video_file, start: int, end: int, name: bytes) -> Optional[Tuple[int, int]]:
+    """Find an atom among siblings and return its payload start and end offsets"""
+    offset = start
+    while offset + 8 <= end:
+        video_file.seek(offset)
+        atom_size, atom_type = struct.unpack(">I4s", video_file.read(8))
+        header_size = 8
+        if atom_size == 1:
+            atom_size = struct.unpack(">Q", video_file.read(8))[0]
+            header_size = 16
+        elif atom_size == 0:
+            atom_size = end - offset
+        
+        if atom_size < header_size:
+            return None
+        if atom_type == name:
+            return offset + header_size, offset + atom_size
+        offset += atom_size
+    
+    return None
+
 class VideoMemory:
     """Video memory system for maintaining video data"""
     
     def __init__(self):
-        # Initialize database connection
-        pass
+        # Video data is stored as compressed JSON blobs
+        self.conn = open_sqlite(os.getenv("VIDEO_DB_PATH", "output/videos.db"))
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS videos ("
+                "video_id TEXT PRIMARY KEY, blob BLOB NOT NULL)"
+            )
     
     def save_video(self, video_data: Dict):
         """Save video data to database"""
-        pass
+        video_id = video_data.setdefault("video_id", uuid7().hex)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO videos (video_id, blob) VALUES (?, ?)",
+                (video_id, pack(video_data))
+            )
     
     def get_video(self, video_id: str) -> Dict:
         """Get video data from database"""
-        pass
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT blob FROM videos WHERE video_id = ?",
+                (video_id,)
+            ).fetchone()
+        return unpack(row[0]) if row else None
     
     def update_video_metadata(self, video_id: str, metadata: Dict):
         """Update video metadata"""
-        pass 
\ No newline at end of file
+        video_data = self.get_video(video_id)
+        if video_data is None:
+            return
+        video_data["metadata"].update(metadata)
+        self.save_video(video_data)
@@ -1,92 +1,247 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
+import asyncio
 import logging
-from datetime import datetime
+import random
+import threading
+import time
+import aiofiles
+import httplib2
+import httpx
+from datetime import datetime, timedelta, timezone
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-import json
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import Resource, build
+from googleapiclient.http import HttpRequest
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
 from dotenv import load_dotenv
+from app.database import engine
+from app.models.database import Series, YouTubeData, YouTubeUpload
+from app.core.ids import uuid7
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Resumable upload endpoint for videos.insert
+UPLOAD_URL = "https://www.googleapis.com/upload/youtube/v3/videos"
+
+# Resumable upload chunks must be a multiple of 256 KiB; larger chunks
+# mean fewer round-trips and far better throughput on fast links
+UPLOAD_CHUNK_ALIGNMENT = 256 * 1024
+UPLOAD_CHUNK_SIZE = max(
+    int(os.getenv("YOUTUBE_UPLOAD_CHUNK_SIZE", str(100 * 1024 * 1024))) // UPLOAD_CHUNK_ALIGNMENT,
+    1
+) * UPLOAD_CHUNK_ALIGNMENT
+
+# Resource parts written by each insert; must match the request bodies
+_VIDEO_INSERT_PARTS = "snippet,status"
+_PLAYLIST_INSERT_PARTS = "snippet,status"
+_PLAYLIST_ITEM_PARTS = "snippet"
+
+# Chunk failures worth resuming after a backoff, per the resumable upload guide
+UPLOAD_RETRY_STATUSES = (500, 502, 503, 504)
+UPLOAD_MAX_RETRIES = int(os.getenv("YOUTUBE_UPLOAD_MAX_RETRIES", "8"))
+
+# OAuth scopes used both to load saved tokens and to authorize new ones
+_YT_SCOPES = ('https://www.googleapis.com/auth/youtube',)
+
+# Access tokens are refreshed this long before they expire
+CREDENTIAL_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Fallback refresh interval when a token carries no expiry
+CREDENTIAL_REFRESH_INTERVAL = 55 * 60
+
+class _CredentialCache:
+    """Process-wide OAuth credentials refreshed ahead of expiry"""
+    
+    def __init__(self, token_path: str, scopes: Tuple[str, ...]):
+        self.token_path = token_path
+        self.scopes = scopes
+        self._lock = threading.Lock()
+        self._creds: Optional[Credentials] = None
+        self._refresh_thread: Optional[threading.Thread] = None
+    
+    def get(self) -> Credentials:
+        """Get credentials, loading them from disk on first use"""
+        with self._lock:
+            if self._creds is None:
+                self._creds = self._load()
+                self._refresh_thread = threading.Thread(
+                    target=self._refresh_loop,
+                    name="youtube-credential-refresh",
+                    daemon=True
+                )
+                self._refresh_thread.start()
+            return self._creds
+    
+    def refresh_if_expired(self) -> Credentials:
+        """Refresh the access token if it is no longer valid"""
+        with self._lock:
+            # Checked again under the lock; the background thread may
+            # have refreshed while this caller waited
+            if not self._creds.valid:
+                self._creds.refresh(Request())
+                self._save(self._creds)
+            return self._creds
+    
+    def _load(self) -> Credentials:
+        """Load saved credentials, refreshing or authorizing as needed"""
+        creds = None
+        
+        # Load existing credentials
+        if os.path.exists(self.token_path):
+            creds = Credentials.from_authorized_user_file(self.token_path, self.scopes)
+        
+        # Refresh or create new credentials
+        if not creds or not creds.valid:
+            if creds and creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+            else:
+                flow = InstalledAppFlow.from_client_secrets_file(
+                    'client_secrets.json',
+                    self.scopes
+                )
+                creds = flow.run_local_server(port=0)
+            
+            self._save(creds)
+        
+        return creds
+    
+    def _save(self, creds: Credentials):
+        """Write credentials atomically so a crash never leaves a torn token file"""
+        tmp_path = f"{self.token_path}.tmp"
+        with open(tmp_path, 'w') as token:
+            token.write(creds.to_json())
+        os.replace(tmp_path, self.token_path)
+    
+    def _refresh_loop(self):
+        """Refresh the access token shortly before it expires"""
+        while True:
+            # Credentials.expiry is a naive UTC datetime
+            expiry = self._creds.expiry
+            if expiry is None:
+                delay = CREDENTIAL_REFRESH_INTERVAL
+            else:
+                delay = (expiry - CREDENTIAL_REFRESH_MARGIN - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                time.sleep(delay)
+            
+            try:
+                with self._lock:
+                    self._creds.refresh(Request())
+                    self._save(self._creds)
+            except Exception as e:
+                logger.warning("Failed to refresh YouTube credentials: %s", e)
+                time.sleep(60)
+
+# Shared credentials for every YouTubeIntegration in the process
+_CREDENTIALS = _CredentialCache('token.json', _YT_SCOPES)
+
+# Data API client shared across instances, built from the bundled
+# discovery document. httplib2 connections are not thread-safe, so each
+# request runs on a keep-alive connection owned by the calling thread.
+_YT_CLIENT: Optional[Resource] = None
+_YT_CLIENT_LOCK = threading.Lock()
+_YT_HTTP = threading.local()
+
+def _thread_http() -> AuthorizedHttp:
+    """Get the calling thread's authorized connection"""
+    http = getattr(_YT_HTTP, "http", None)
+    if http is None:
+        # Tokens are refreshed only through _CREDENTIALS, never by the
+        # transport on a 401
+        http = AuthorizedHttp(
+            _CREDENTIALS.get(),
+            http=httplib2.Http(timeout=60),
+            refresh_status_codes=()
+        )
+        _YT_HTTP.http = http
+    return http
+
+def _build_request(http, *args, **kwargs) -> HttpRequest:
+    """Build an API request on the calling thread's connection"""
+    _CREDENTIALS.refresh_if_expired()
+    return HttpRequest(_thread_http(), *args, **kwargs)
+
 class YouTubeIntegration:
     """YouTube integration system for AI drama series"""
     
     def __init__(self):
+        self.credentials = None
         self.youtube = self.initialize_youtube_client()
         self.channel_memory = ChannelMemory()
+        
+        # Playlist IDs by series ID; the lock keeps concurrent uploads of
+        # one series from each creating a playlist
+        self._playlist_cache: Dict[str, str] = {}
+        self._playlist_lock = threading.Lock()
     
     def initialize_youtube_client(self):
         """Initialize YouTube API client"""
         try:
-            credentials = self.get_credentials()
-            return build('youtube', 'v3', credentials=credentials)
+            global _YT_CLIENT
+            self.credentials = self.get_credentials()
+            with _YT_CLIENT_LOCK:
+                if _YT_CLIENT is None:
+                    _YT_CLIENT = build(
+                        'youtube',
+                        'v3',
+                        http=_thread_http(),
+                        requestBuilder=_build_request,
+                        cache_discovery=False,
+                        static_discovery=True
+                    )
+            return _YT_CLIENT
         except Exception as e:
-            logger.error(f"Failed to initialize YouTube client: {str(e)}")
+            logger.error("Failed to initialize YouTube client: %s", e)
             raise
     
     def get_credentials(self) -> Credentials:
         """Get YouTube API credentials"""
         try:
-            creds = None
-            token_path = 'token.json'
-            
-            # Load existing credentials
-            if os.path.exists(token_path):
-                creds = Credentials.from_authorized_user_info(
-                    json.loads(open(token_path).read()),
-                    ['https://www.googleapis.com/auth/youtube']
-                )
-            
-            # Refresh or create new credentials
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
-                else:
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        'client_secrets.json',
-                        ['https://www.googleapis.com/auth/youtube']
-                    )
-                    creds = flow.run_local_server(port=0)
-                
-                # Save credentials
-                with open(token_path, 'w') as token:
-                    token.write(creds.to_json())
-            
-            return creds
-            
+            return _CREDENTIALS.get()
         except Exception as e:
-            logger.error(f"Failed to get credentials: {str(e)}")
+            logger.error("Failed to get credentials: %s", e)
             raise
     
-    def upload_episode(self, video_data: Dict, series_data: Dict) -> Dict:
+    async def upload_episode(self, video_data: Dict, series_data: Dict) -> Dict:
         """Upload episode to YouTube"""
         try:
+            # A retried task finds the upload it already recorded instead
+            # of uploading the video a second time
+            existing = await asyncio.to_thread(
+                self.channel_memory.get_upload,
+                video_data["video_id"]
+            )
+            if existing is not None:
+                return existing
+            
+            # Check the series row the channel data hangs off before
+            # anything is created on YouTube, so a missing parent cannot
+            # leave an orphaned video or playlist behind
+            await asyncio.to_thread(
+                self.channel_memory.require_series,
+                series_data["series_id"]
+            )
+            
             # Prepare video metadata
             video_metadata = self.prepare_video_metadata(video_data, series_data)
             
-            # Upload video file
-            video_id = self.upload_video_file(
-                video_data["video_path"],
-                video_metadata
+            # Upload video file while creating the playlist if needed; the
+            # playlist does not depend on the video, so its round-trips stay
+            # off the critical path
+            video_id, playlist_id = await asyncio.gather(
+                self.upload_video_file(video_data["video_path"], video_metadata),
+                asyncio.to_thread(self.ensure_series_playlist, series_data)
             )
             
-            # Update video details
-            self.update_video_details(video_id, video_metadata)
-            
-            # Create playlist if needed
-            playlist_id = self.ensure_series_playlist(series_data)
-            
             # Add video to playlist
-            self.add_to_playlist(video_id, playlist_id)
+            await asyncio.to_thread(self.add_to_playlist, video_id, playlist_id)
             
             # Prepare upload data
             upload_data = {
@@ -95,16 +250,18 @@ class YouTubeIntegration:
                 "title": video_metadata["title"],
                 "description": video_metadata["description"],
                 "tags": video_metadata["tags"],
-                "published_at": datetime.utcnow().isoformat()
+                "published_at": datetime.now(timezone.utc).isoformat(),
+                "series_id": series_data["series_id"],
+                "episode_video_id": video_data["video_id"]
             }
             
             # Save to channel memory
-            self.channel_memory.save_upload(upload_data)
+            await asyncio.to_thread(self.channel_memory.save_upload, upload_data)
             
             return upload_data
             
         except Exception as e:
-            logger.error(f"Failed to upload episode: {str(e)}")
+            logger.error("Failed to upload episode: %s", e)
             raise
     
     def prepare_video_metadata(self, video_data: Dict, series_data: Dict) -> Dict:
@@ -129,11 +286,11 @@ class YouTubeIntegration:
             }
             
         except Exception as e:
-            logger.error(f"Failed to prepare video metadata: {str(e)}")
+            logger.error("Failed to prepare video metadata: %s", e)
             raise
     
-    def upload_video_file(self, video_path: str, metadata: Dict) -> str:
-        """Upload video file to YouTube"""
+    async def upload_video_file(self, video_path: str, metadata: Dict) -> str:
+        """Upload video file to YouTube with a chunked resumable upload"""
         try:
             request_body = {
                 "snippet": {
@@ -148,88 +305,154 @@ class YouTubeIntegration:
                 }
             }
             
-            media = MediaFileUpload(
-                video_path,
-                mimetype='video/mp4',
-                resumable=True
-            )
-            
-            request = self.youtube.videos().insert(
-                part=",".join(request_body.keys()),
-                body=request_body,
-                media_body=media
-            )
+            total_size = os.path.getsize(video_path)
             
-            response = request.execute()
-            return response["id"]
+            # A client per upload keeps the connection bound to the loop
+            # running this upload; the upload itself dominates its cost
+            async with httpx.AsyncClient(timeout=httpx.Timeout(60.0, write=300.0)) as client:
+                upload_url = await self.start_resumable_upload(client, request_body, total_size)
+                
+                # Stream the file in fixed-size chunks so only one chunk is
+                # held in memory at a time
+                async with aiofiles.open(video_path, "rb") as video_file:
+                    offset = 0
+                    failures = 0
+                    error: Optional[Exception] = None
+                    while True:
+                        if failures:
+                            # After a transient failure ask the server how much
+                            # it kept instead of assuming the chunk landed
+                            chunk = b""
+                            end = -1
+                            content_range = f"bytes */{total_size}"
+                        else:
+                            await video_file.seek(offset)
+                            chunk = await video_file.read(UPLOAD_CHUNK_SIZE)
+                            end = offset + len(chunk) - 1
+                            content_range = f"bytes {offset}-{end}/{total_size}"
+                        
+                        try:
+                            response = await client.put(
+                                upload_url,
+                                headers={
+                                    **await self.get_auth_headers(),
+                                    "Content-Range": content_range
+                                },
+                                content=chunk
+                            )
+                        except httpx.TransportError as e:
+                            response = None
+                            error = e
+                        
+                        # Back off on connection errors and 5xx, then resume
+                        if response is None or response.status_code in UPLOAD_RETRY_STATUSES:
+                            failures += 1
+                            if failures > UPLOAD_MAX_RETRIES:
+                                if response is not None:
+                                    response.raise_for_status()
+                                raise error
+                            await asyncio.sleep(min(2 ** failures, 64) + random.random())
+                            continue
+                        failures = 0
+                        
+                        # 308 means the chunk was stored and more are expected
+                        if response.status_code == 308:
+                            offset = self.next_upload_offset(response, end)
+                            continue
+                        
+                        response.raise_for_status()
+                        return response.json()["id"]
             
         except Exception as e:
-            logger.error(f"Failed to upload video file: {str(e)}")
+            logger.error("Failed to upload video file: %s", e)
             raise
     
-    def update_video_details(self, video_id: str, metadata: Dict):
-        """Update video details after upload"""
-        try:
-            request_body = {
-                "id": video_id,
-                "snippet": {
-                    "title": metadata["title"],
-                    "description": metadata["description"],
-                    "tags": metadata["tags"],
-                    "categoryId": metadata["category_id"]
-                },
-                "status": {
-                    "privacyStatus": metadata["privacy_status"],
-                    "selfDeclaredMadeForKids": False
-                }
-            }
-            
-            self.youtube.videos().update(
-                part=",".join(request_body.keys()),
-                body=request_body
-            ).execute()
-            
-        except Exception as e:
-            logger.error(f"Failed to update video details: {str(e)}")
-            raise
+    async def start_resumable_upload(self, client: httpx.AsyncClient, request_body: Dict, total_size: int) -> str:
+        """Start a resumable upload session and return its upload URL"""
+        response = await client.post(
+            UPLOAD_URL,
+            params={
+                "uploadType": "resumable",
+                "part": _VIDEO_INSERT_PARTS
+            },
+            headers={
+                **await self.get_auth_headers(),
+                "X-Upload-Content-Length": str(total_size),
+                "X-Upload-Content-Type": "video/mp4"
+            },
+            json=request_body
+        )
+        response.raise_for_status()
+        return response.headers["Location"]
+    
+    async def get_auth_headers(self) -> Dict[str, str]:
+        """Get authorization headers, refreshing the access token if needed"""
+        if not self.credentials.valid:
+            await asyncio.to_thread(_CREDENTIALS.refresh_if_expired)
+        return {"Authorization": f"Bearer {self.credentials.token}"}
+    
+    def next_upload_offset(self, response: httpx.Response, end: int) -> int:
+        """Get the next byte offset from a resumable upload 308 response"""
+        # The Range header reports what the server actually persisted
+        uploaded = response.headers.get("Range")
+        if uploaded:
+            return int(uploaded.rsplit("-", 1)[1]) + 1
+        return end + 1
     
     def ensure_series_playlist(self, series_data: Dict) -> str:
         """Ensure series playlist exists"""
         try:
-            # Check if playlist exists
-            playlist_id = self.channel_memory.get_playlist_id(series_data["series_id"])
+            series_id = series_data["series_id"]
             
-            if not playlist_id:
-                # Create new playlist
-                request_body = {
-                    "snippet": {
-                        "title": f"{series_data['title']} - Full Series",
-                        "description": series_data["description"]
-                    },
-                    "status": {
-                        "privacyStatus": "public"
-                    }
-                }
-                
-                response = self.youtube.playlists().insert(
-                    part=",".join(request_body.keys()),
-                    body=request_body
-                ).execute()
+            # Check the in-process cache before the database
+            playlist_id = self._playlist_cache.get(series_id)
+            if playlist_id:
+                return playlist_id
+            
+            with self._playlist_lock:
+                # Check if playlist exists
+                playlist_id = self._playlist_cache.get(series_id) or self.channel_memory.get_playlist_id(series_id)
                 
-                playlist_id = response["id"]
+                if not playlist_id:
+                    # Create new playlist
+                    request_body = {
+                        "snippet": {
+                            "title": f"{series_data['title']} - Full Series",
+                            "description": series_data["description"]
+                        },
+                        "status": {
+                            "privacyStatus": "public"
+                        }
+                    }
+                    
+                    response = self.youtube.playlists().insert(
+                        part=_PLAYLIST_INSERT_PARTS,
+                        body=request_body
+                    ).execute()
+                    
+                    # Save playlist ID; another process may have stored a
+                    # playlist for the series first, in which case that one
+                    # is kept and the one just created is deleted
+                    stored_id = self.channel_memory.save_playlist(series_id, response["id"])
+                    if stored_id != response["id"]:
+                        self.delete_playlist(response["id"])
+                    playlist_id = stored_id
                 
-                # Save playlist ID
-                self.channel_memory.save_playlist(
-                    series_data["series_id"],
-                    playlist_id
-                )
+                self._playlist_cache[series_id] = playlist_id
             
             return playlist_id
             
         except Exception as e:
-            logger.error(f"Failed to ensure series playlist: {str(e)}")
+            logger.error("Failed to ensure series playlist: %s", e)
             raise
     
+    def delete_playlist(self, playlist_id: str):
+        """Delete a playlist that lost the race to be the series playlist"""
+        try:
+            self.youtube.playlists().delete(id=playlist_id).execute()
+        except Exception as e:
+            logger.warning("Failed to delete duplicate playlist %s: %s", playlist_id, e)
+    
     def add_to_playlist(self, video_id: str, playlist_id: str):
         """Add video to playlist"""
         try:
@@ -244,40 +467,41 @@ class YouTubeIntegration:
             }
             
             self.youtube.playlistItems().insert(
-                part=",".join(request_body.keys()),
+                part=_PLAYLIST_ITEM_PARTS,
                 body=request_body
             ).execute()
             
         except Exception as e:
-            logger.error(f"Failed to add video to playlist: {str(e)}")
+            logger.error("Failed to add video to playlist: %s", e)
             raise
     
     def generate_video_description(self, video_data: Dict, series_data: Dict) -> str:
         """Generate video description"""
         try:
-            description = f"""
-            {video_data['metadata']['title']}
-            
-            Episode {video_data['metadata']['episode_number']} of {series_data['title']}
-            
-            {video_data['metadata']['summary']}
-            
-            Series Description:
-            {series_data['description']}
-            
-            Characters in this episode:
-            {', '.join(video_data['metadata']['characters'])}
-            
-            Locations:
-            {', '.join(video_data['metadata']['locations'])}
-            
-            #AIDrama #AI #Drama #Series
-            """
-            
-            return description.strip()
+            metadata = video_data['metadata']
+            description = "\n".join([
+                metadata['title'],
+                "",
+                f"Episode {metadata['episode_number']} of {series_data['title']}",
+                "",
+                metadata['summary'],
+                "",
+                "Series Description:",
+                series_data['description'],
+                "",
+                "Characters in this episode:",
+                ", ".join(metadata['characters']),
+                "",
+                "Locations:",
+                ", ".join(metadata['locations']),
+                "",
+                "#AIDrama #AI #Drama #Series"
+            ])
+            
+            return description
             
         except Exception as e:
-            logger.error(f"Failed to generate video description: {str(e)}")
+            logger.error("Failed to generate video description: %s", e)
             raise
     
     def generate_video_tags(self, video_data: Dict, series_data: Dict) -> List[str]:
@@ -294,27 +518,158 @@ class YouTubeIntegration:
                 *video_data["metadata"]["locations"]
             ]
             
-            return list(set(tags))  # Remove duplicates
+            return list(dict.fromkeys(tags))  # Remove duplicates, keeping order
             
         except Exception as e:
-            logger.error(f"Failed to generate video tags: {str(e)}")
+            logger.error("Failed to generate video tags: %s", e)
             raise
 
 class ChannelMemory:
     """Channel memory system for maintaining YouTube data"""
     
     def __init__(self):
-        # Initialize database connection
-        pass
+        # Writes are single upsert statements on the shared engine
+        self.engine = engine
     
     def save_upload(self, upload_data: Dict):
         """Save upload data to database"""
-        pass
+        self.save_uploads([upload_data])
+    
+    def save_uploads(self, uploads: List[Dict]):
+        """Upsert several uploads in one statement"""
+        try:
+            if not uploads:
+                return
+            
+            with self.engine.begin() as connection:
+                # Resolve channel rows up front; an upload for a series
+                # with no saved playlist is an error, not a NULL channel
+                series_ids = {upload["series_id"] for upload in uploads}
+                channel_ids = dict(connection.execute(
+                    select(YouTubeData.series_id, YouTubeData.id).where(
+                        YouTubeData.series_id.in_(series_ids)
+                    )
+                ).all())
+                missing = series_ids - channel_ids.keys()
+                if missing:
+                    raise ValueError(f"No YouTube channel data for series {', '.join(sorted(missing))}")
+                
+                connection.execute(self.build_upsert(uploads, channel_ids))
+                
+        except Exception as e:
+            logger.error("Failed to save uploads: %s", e)
+            raise
+    
+    def build_upsert(self, uploads: List[Dict], channel_ids: Dict[str, str]):
+        """Build the upsert statement for a list of uploads"""
+        rows = [
+            {
+                "id": str(uuid7()),
+                "video_id": upload["episode_video_id"],
+                "channel_id": channel_ids[upload["series_id"]],
+                "youtube_video_id": upload["video_id"],
+                "title": upload["title"],
+                "description": upload["description"],
+                "tags": upload["tags"],
+                "published_at": datetime.fromisoformat(upload["published_at"])
+            }
+            for upload in uploads
+        ]
+        
+        # Replays of an upload update the existing row instead of
+        # failing on the unique YouTube video ID
+        stmt = insert(YouTubeUpload).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[YouTubeUpload.youtube_video_id],
+            set_={
+                "title": stmt.excluded.title,
+                "description": stmt.excluded.description,
+                "tags": stmt.excluded.tags,
+                "published_at": stmt.excluded.published_at,
+                "updated_at": func.now()
+            }
+        )
+    
+    def get_upload(self, episode_video_id: str) -> Optional[Dict]:
+        """Get the recorded upload of an episode video"""
+        try:
+            with self.engine.connect() as connection:
+                row = connection.execute(
+                    select(
+                        YouTubeUpload.youtube_video_id,
+                        YouTubeData.playlist_id,
+                        YouTubeUpload.title,
+                        YouTubeUpload.description,
+                        YouTubeUpload.tags,
+                        YouTubeUpload.published_at,
+                        YouTubeData.series_id
+                    )
+                    .join(YouTubeData, YouTubeUpload.channel_id == YouTubeData.id)
+                    .where(YouTubeUpload.video_id == episode_video_id)
+                ).first()
+        except Exception as e:
+            logger.error("Failed to get upload: %s", e)
+            raise
+        
+        if row is None:
+            return None
+        return {
+            "video_id": row.youtube_video_id,
+            "playlist_id": row.playlist_id,
+            "title": row.title,
+            "description": row.description,
+            "tags": row.tags,
+            "published_at": row.published_at.isoformat(),
+            "series_id": row.series_id,
+            "episode_video_id": episode_video_id
+        }
+    
+    def require_series(self, series_id: str):
+        """Raise if the series has no row for channel data to reference"""
+        try:
+            with self.engine.connect() as connection:
+                exists = connection.execute(
+                    select(Series.id).where(Series.id == series_id)
+                ).first()
+        except Exception as e:
+            logger.error("Failed to check series: %s", e)
+            raise
+        
+        if exists is None:
+            raise ValueError(f"Series {series_id} is not stored in the database")
     
     def get_playlist_id(self, series_id: str) -> Optional[str]:
         """Get playlist ID for series"""
-        pass
+        try:
+            with self.engine.connect() as connection:
+                return connection.execute(
+                    select(YouTubeData.playlist_id).where(YouTubeData.series_id == series_id)
+                ).scalar_one_or_none()
+        except Exception as e:
+            logger.error("Failed to get playlist ID: %s", e)
+            raise
     
-    def save_playlist(self, series_id: str, playlist_id: str):
-        """Save playlist data to database"""
-        pass 
\ No newline at end of file
+    def save_playlist(self, series_id: str, playlist_id: str) -> str:
+        """Save playlist data to database and return the stored playlist ID"""
+        try:
+            # The no-op update makes RETURNING report the existing row's
+            # playlist when another upload saved one first
+            stmt = insert(YouTubeData).values(
+                id=str(uuid7()),
+                series_id=series_id,
+                channel_id=os.getenv("YOUTUBE_CHANNEL_ID", ""),
+                playlist_id=playlist_id,
+                channel_name=os.getenv("YOUTUBE_CHANNEL_NAME", ""),
+                channel_description=""
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[YouTubeData.series_id],
+                set_={"playlist_id": YouTubeData.playlist_id}
+            ).returning(YouTubeData.playlist_id)
+            
+            with self.engine.begin() as connection:
+                return connection.execute(stmt).scalar_one()
+                
+        except Exception as e:
+            logger.error("Failed to save playlist: %s", e)
+            raise
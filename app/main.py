@@ -1,21 +1,49 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import logging
-from typing import Dict, List
+import logging.config
+import os
+from prometheus_fastapi_instrumentator import Instrumentator
 from app.api.video import router as video_router
+from app.core.jobs import job_queue
+from app.core.http import close_clients
+from app.core.cache import init_response_cache, close_cache
+from app.core.health import health_prober
+from app.core.video_generator import close_scene_pool
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging once for the whole application
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {
+            "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
+            # No asctime: formatting it dominates per-record cost and the
+            # container runtime already timestamps every line
+            "format": "%(name)s %(levelname)s %(message)s"
+        }
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "json"
+        }
+    },
+    "root": {
+        # Request volume is tracked by Prometheus metrics, not log lines
+        "level": os.getenv("LOG_LEVEL", "WARNING"),
+        "handlers": ["console"]
+    }
+}
+logging.config.dictConfig(LOGGING_CONFIG)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="AI Drama Automation System",
     description="Automated system for creating and managing AI-generated drama series",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware configuration
@@ -27,9 +55,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts and latency histograms, scraped from /metrics
+Instrumentator().instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
+
 # Include routers
 app.include_router(video_router, prefix="/api/v1/video", tags=["video"])
 
+@app.on_event("startup")
+async def startup():
+    """Start background job workers, the response cache and health probes"""
+    init_response_cache()
+    await job_queue.start()
+    await health_prober.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background workers and close shared clients"""
+    await health_prober.stop()
+    await job_queue.stop()
+    await close_scene_pool()
+    await close_clients()
+    await close_cache()
+
 @app.get("/")
 async def root():
     """Root endpoint - System status check"""
@@ -42,19 +89,12 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    try:
-        # Add system health checks here
-        return {
-            "status": "healthy",
-            "components": {
-                "api": "operational",
-                "database": "operational",
-                "queue": "operational"
-            }
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        raise HTTPException(status_code=500, detail="System health check failed")
+    # Dependencies are probed in the background; this only returns the
+    # latest snapshot so load balancer probes never touch the database
+    return ORJSONResponse(
+        health_prober.state,
+        status_code=200 if health_prober.healthy else 503
+    )
 
 @app.get("/api/v1/system/status")
 async def system_status():
@@ -76,9 +116,19 @@ async def system_status():
             }
         }
     except Exception as e:
-        logger.error(f"Status check failed: {str(e)}")
+        logger.exception("Status check failed: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get system status")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # The import string lets uvicorn fork workers; job state lives in each
+    # process's memory, so more than one worker only suits deployments
+    # that do not poll job status across workers
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1"))
+    ) 
\ No newline at end of file
@@ -1,95 +1,141 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean
+from sqlalchemy import Column, BigInteger, Integer, SmallInteger, String, Text, DateTime, Enum, ForeignKey, Identity, JSON, Index, Uuid, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.ext.declarative import declarative_base
-from datetime import datetime
+from app.database import Base
 
-Base = declarative_base()
+# Binary JSONB on PostgreSQL (no re-parse on read, GIN-indexable);
+# plain JSON on other backends
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+# Lists of short strings as native text arrays on PostgreSQL, which get
+# real statistics and GIN-indexed @> / && operators
+TextListType = JSON().with_variant(ARRAY(Text()), "postgresql")
+
+# IDs are UUID strings in the application; Uuid stores them as native
+# 16-byte UUIDs on PostgreSQL and as CHAR(32) elsewhere
+IDType = Uuid(as_uuid=False)
+
+# Native enums on PostgreSQL for low-cardinality columns
+SeriesStatus = Enum("active", "completed", "paused", name="series_status")
+EpisodeStatus = Enum("draft", "approved", "published", name="episode_status")
+CharacterRole = Enum("main", "supporting", name="character_role")
+VideoStatus = Enum("processing", "completed", "failed", name="video_status")
 
 class Series(Base):
     """Drama series model"""
     __tablename__ = "series"
+    __table_args__ = (
+        # Containment filters such as themes @> '["betrayal"]'
+        Index("ix_series_themes_gin", "themes", postgresql_using="gin", postgresql_ops={"themes": "jsonb_path_ops"}),
+    )
     
-    id = Column(String(50), primary_key=True)
+    id = Column(IDType, primary_key=True)
     title = Column(String(200), nullable=False)
     genre = Column(String(100), nullable=False)
     description = Column(Text, nullable=False)
     total_episodes = Column(Integer, nullable=False)
     target_audience = Column(String(100), nullable=False)
     tone = Column(String(100), nullable=False)
-    themes = Column(JSON, nullable=False)
-    status = Column(String(50), nullable=False, default="active")
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    themes = Column(JSONType, nullable=False)
+    status = Column(SeriesStatus, nullable=False, default="active")
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
-    # Relationships
-    episodes = relationship("Episode", back_populates="series")
-    characters = relationship("Character", back_populates="series")
-    youtube_data = relationship("YouTubeData", back_populates="series", uselist=False)
+    # Relationships; child rows are removed by ON DELETE CASCADE, so the
+    # ORM does not load them before deleting a parent
+    episodes = relationship("Episode", back_populates="series", cascade="all, delete", passive_deletes=True)
+    characters = relationship("Character", back_populates="series", cascade="all, delete", passive_deletes=True)
+    youtube_data = relationship("YouTubeData", back_populates="series", uselist=False, cascade="all, delete", passive_deletes=True)
 
 class Episode(Base):
     """Episode model"""
     __tablename__ = "episodes"
+    __table_args__ = (
+        # Episodes of a series in order, and one row per episode number
+        Index("ix_episodes_series_episode", "series_id", "episode_number", unique=True),
+        Index("ix_episodes_key_events_gin", "key_events", postgresql_using="gin", postgresql_ops={"key_events": "jsonb_path_ops"}),
+    )
     
-    id = Column(String(50), primary_key=True)
-    series_id = Column(String(50), ForeignKey("series.id"), nullable=False)
-    episode_number = Column(Integer, nullable=False)
+    id = Column(IDType, primary_key=True)
+    series_id = Column(IDType, ForeignKey("series.id", ondelete="CASCADE"), nullable=False)
+    episode_number = Column(SmallInteger, nullable=False)
     title = Column(String(200), nullable=False)
-    script = Column(JSON, nullable=False)
+    script = Column(JSONType, nullable=False)
     summary = Column(Text, nullable=False)
-    key_events = Column(JSON, nullable=False)
-    character_developments = Column(JSON, nullable=False)
-    relationship_changes = Column(JSON, nullable=False)
-    unresolved_plots = Column(JSON, nullable=False)
-    cliffhanger = Column(Text, nullable=False)
-    status = Column(String(50), nullable=False, default="draft")
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    key_events = Column(JSONType, nullable=False)
+    character_developments = Column(JSONType, nullable=False)
+    relationship_changes = Column(JSONType, nullable=False)
+    unresolved_plots = Column(JSONType, nullable=False)
+    cliffhanger = Column(String(1000), nullable=False)
+    status = Column(EpisodeStatus, nullable=False, default="draft")
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     series = relationship("Series", back_populates="episodes")
-    video = relationship("Video", back_populates="episode", uselist=False)
-    character_states = relationship("CharacterState", back_populates="episode")
+    video = relationship("Video", back_populates="episode", uselist=False, cascade="all, delete", passive_deletes=True)
+    character_states = relationship("CharacterState", back_populates="episode", cascade="all, delete", passive_deletes=True)
 
 class Character(Base):
     """Character model"""
     __tablename__ = "characters"
+    __table_args__ = (
+        # Containment filters on character traits
+        Index("ix_characters_personality_gin", "personality", postgresql_using="gin"),
+        Index("ix_characters_goals_gin", "goals", postgresql_using="gin", postgresql_ops={"goals": "jsonb_path_ops"}),
+        Index("ix_characters_secrets_gin", "secrets", postgresql_using="gin", postgresql_ops={"secrets": "jsonb_path_ops"}),
+    )
     
-    id = Column(String(50), primary_key=True)
-    series_id = Column(String(50), ForeignKey("series.id"), nullable=False)
+    id = Column(IDType, primary_key=True)
+    series_id = Column(IDType, ForeignKey("series.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
-    role = Column(String(50), nullable=False)  # main or supporting
-    age = Column(Integer, nullable=False)
+    role = Column(CharacterRole, nullable=False)
+    age = Column(SmallInteger, nullable=False)
     occupation = Column(String(100), nullable=False)
-    personality = Column(JSON, nullable=False)
+    personality = Column(TextListType, nullable=False)
     background = Column(Text, nullable=False)
-    goals = Column(JSON, nullable=False)
-    secrets = Column(JSON, nullable=False)
+    goals = Column(JSONType, nullable=False)
+    secrets = Column(JSONType, nullable=False)
     avatar_id = Column(String(100), nullable=True)
     voice_id = Column(String(100), nullable=True)
-    profile = Column(JSON, nullable=False)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    profile = Column(JSONType, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     series = relationship("Series", back_populates="characters")
-    states = relationship("CharacterState", back_populates="character")
+    states = relationship("CharacterState", back_populates="character", cascade="all, delete", passive_deletes=True)
 
 class CharacterState(Base):
     """Character state model for tracking development"""
     __tablename__ = "character_states"
+    __table_args__ = (
+        # State of a character as of a given episode, index-only
+        Index(
+            "ix_character_states_triple",
+            "series_id",
+            "episode_id",
+            "character_id",
+            postgresql_include=["emotional_state", "location"]
+        ),
+        Index("ix_character_states_active_goals_gin", "active_goals", postgresql_using="gin"),
+        Index("ix_character_states_created_at_brin", "created_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+        # Partitions are created by the migration
+        {"postgresql_partition_by": "HASH (series_id)"},
+    )
     
-    id = Column(String(50), primary_key=True)
-    series_id = Column(String(50), ForeignKey("series.id"), nullable=False)
-    episode_id = Column(String(50), ForeignKey("episodes.id"), nullable=False)
-    character_id = Column(String(50), ForeignKey("characters.id"), nullable=False)
+    id = Column(IDType, primary_key=True)
+    series_id = Column(IDType, ForeignKey("series.id", ondelete="CASCADE"), primary_key=True)
+    episode_id = Column(IDType, ForeignKey("episodes.id", ondelete="CASCADE"), nullable=False)
+    character_id = Column(IDType, ForeignKey("characters.id", ondelete="CASCADE"), nullable=False)
     emotional_state = Column(String(100), nullable=False)
     location = Column(String(200), nullable=False)
-    active_goals = Column(JSON, nullable=False)
-    resolved_goals = Column(JSON, nullable=False)
-    new_traits = Column(JSON, nullable=False)
-    current_situation = Column(Text, nullable=False)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    active_goals = Column(TextListType, nullable=False)
+    resolved_goals = Column(TextListType, nullable=False)
+    new_traits = Column(TextListType, nullable=False)
+    current_situation = Column(String(1000), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     episode = relationship("Episode", back_populates="character_states")
@@ -98,59 +144,83 @@ class CharacterState(Base):
 class Video(Base):
     """Video model"""
     __tablename__ = "videos"
+    __table_args__ = (
+        Index("ix_videos_scenes_gin", "scenes", postgresql_using="gin", postgresql_ops={"scenes": "jsonb_path_ops"}),
+        Index("ix_videos_video_metadata_gin", "video_metadata", postgresql_using="gin", postgresql_ops={"video_metadata": "jsonb_path_ops"}),
+        Index("ix_videos_created_at_brin", "created_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+    )
     
-    id = Column(String(50), primary_key=True)
-    episode_id = Column(String(50), ForeignKey("episodes.id"), nullable=False)
-    file_path = Column(String(500), nullable=False)
+    id = Column(IDType, primary_key=True)
+    episode_id = Column(IDType, ForeignKey("episodes.id", ondelete="CASCADE"), nullable=False, index=True)
+    root_id = Column(SmallInteger, ForeignKey("storage_roots.id", ondelete="RESTRICT"), nullable=False)
+    path_suffix = Column(String(200), nullable=False)
     duration = Column(Integer, nullable=False)  # in seconds
-    scenes = Column(JSON, nullable=False)
-    metadata = Column(JSON, nullable=False)
-    status = Column(String(50), nullable=False, default="processing")
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    scenes = Column(JSONType, nullable=False)
+    video_metadata = Column(JSONType, nullable=False)
+    status = Column(VideoStatus, nullable=False, default="processing")
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     episode = relationship("Episode", back_populates="video")
-    youtube_upload = relationship("YouTubeUpload", back_populates="video", uselist=False)
+    root = relationship("StorageRoot", lazy="joined")
+    
+    @property
+    def file_path(self) -> str:
+        """Full location of the video file"""
+        return f"{self.root.uri.rstrip('/')}/{self.path_suffix}"
+
+class StorageRoot(Base):
+    """Storage location shared by many video files"""
+    __tablename__ = "storage_roots"
+    
+    id = Column(SmallInteger, Identity(), primary_key=True)
+    uri = Column(String(500), nullable=False, unique=True)
 
 class YouTubeData(Base):
     """YouTube channel data model"""
     __tablename__ = "youtube_data"
     
-    id = Column(String(50), primary_key=True)
-    series_id = Column(String(50), ForeignKey("series.id"), nullable=False)
+    id = Column(IDType, primary_key=True)
+    series_id = Column(IDType, ForeignKey("series.id", ondelete="CASCADE"), nullable=False, index=True, unique=True)
     channel_id = Column(String(100), nullable=False)
     playlist_id = Column(String(100), nullable=False)
     channel_name = Column(String(200), nullable=False)
     channel_description = Column(Text, nullable=False)
-    subscriber_count = Column(Integer, nullable=False, default=0)
-    view_count = Column(Integer, nullable=False, default=0)
-    video_count = Column(Integer, nullable=False, default=0)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    subscriber_count = Column(BigInteger, nullable=False, default=0)
+    # View and video totals live in the youtube_channel_stats view
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     series = relationship("Series", back_populates="youtube_data")
-    uploads = relationship("YouTubeUpload", back_populates="channel")
+    uploads = relationship("YouTubeUpload", back_populates="channel", cascade="all, delete", passive_deletes=True)
 
 class YouTubeUpload(Base):
     """YouTube video upload model"""
     __tablename__ = "youtube_uploads"
+    __table_args__ = (
+        # Uploads of a channel, newest first
+        Index("ix_upload_channel_published", "channel_id", "published_at"),
+        Index("ix_youtube_uploads_tags_gin", "tags", postgresql_using="gin", postgresql_ops={"tags": "jsonb_path_ops"}),
+        Index("ix_youtube_uploads_created_at_brin", "created_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+    )
     
-    id = Column(String(50), primary_key=True)
-    video_id = Column(String(50), ForeignKey("videos.id"), nullable=False)
-    channel_id = Column(String(50), ForeignKey("youtube_data.id"), nullable=False)
-    youtube_video_id = Column(String(100), nullable=False)
+    id = Column(IDType, primary_key=True)
+    # Episode videos are kept in the local VideoMemory store, so this
+    # references them by ID without a foreign key
+    video_id = Column(IDType, nullable=False, index=True)
+    channel_id = Column(IDType, ForeignKey("youtube_data.id", ondelete="CASCADE"), nullable=False, index=True)
+    youtube_video_id = Column(String(100), nullable=False, unique=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=False)
-    tags = Column(JSON, nullable=False)
-    view_count = Column(Integer, nullable=False, default=0)
-    like_count = Column(Integer, nullable=False, default=0)
-    comment_count = Column(Integer, nullable=False, default=0)
-    published_at = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    tags = Column(JSONType, nullable=False)
+    view_count = Column(BigInteger, nullable=False, default=0)
+    like_count = Column(BigInteger, nullable=False, default=0)
+    comment_count = Column(BigInteger, nullable=False, default=0)
+    published_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    video = relationship("Video", back_populates="youtube_upload")
     channel = relationship("YouTubeData", back_populates="uploads") 
\ No newline at end of file
@@ -0,0 +1,65 @@
+from typing import Dict, Optional
+import asyncio
+import logging
+import os
+from celery import Celery
+from sqlalchemy import text
+from dotenv import load_dotenv
+from app.core.youtube_integration import YouTubeIntegration
+from app.database import engine
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+# Celery app run by the worker and scheduler services
+celery_app = Celery("ai_drama", broker=REDIS_URL, backend=REDIS_URL)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    # Uploads run for minutes; only acknowledge once they finish so a
+    # worker crash requeues the upload instead of losing it
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    beat_schedule={
+        "refresh-channel-stats": {
+            "task": "youtube.refresh_channel_stats",
+            "schedule": float(os.getenv("CHANNEL_STATS_REFRESH_INTERVAL", "900"))
+        }
+    }
+)
+
+# Created on first use so importing the module never starts an OAuth flow
+_youtube_integration: Optional[YouTubeIntegration] = None
+
+def get_youtube_integration() -> YouTubeIntegration:
+    """Get the worker's YouTube integration"""
+    global _youtube_integration
+    if _youtube_integration is None:
+        _youtube_integration = YouTubeIntegration()
+    return _youtube_integration
+
+@celery_app.task(name="youtube.upload_episode")
+def upload_episode_task(video_data: Dict, series_data: Dict) -> Dict:
+    """Upload an episode video to YouTube"""
+    try:
+        return asyncio.run(
+            get_youtube_integration().upload_episode(video_data, series_data)
+        )
+    except Exception as e:
+        logger.error("Failed to upload episode: %s", e)
+        raise
+
+@celery_app.task(name="youtube.refresh_channel_stats")
+def refresh_channel_stats_task():
+    """Recompute per-channel totals without blocking readers"""
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY youtube_channel_stats"))
+    except Exception as e:
+        logger.error("Failed to refresh channel stats: %s", e)
+        raise
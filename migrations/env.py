@@ -12,8 +12,10 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 # Load environment variables
 load_dotenv()
 
-# Import the SQLAlchemy models
-from app.models.database import Base
+# Import the SQLAlchemy models so every mapper is registered on the
+# shared Base before its metadata is read
+from app.database import Base
+import app.models.database  # noqa: F401
 
 # this is the Alembic Config object
 config = context.config
@@ -46,6 +48,9 @@ def run_migrations_offline():
 
 def run_migrations_online():
     """Run migrations in 'online' mode."""
+    # NullPool is intentional: a migration run is one-shot and uses a
+    # single connection, so a pool would only hold it open afterwards.
+    # The application engine in app.database keeps a QueuePool instead.
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
@@ -5,6 +5,7 @@ Revises:
 Create Date: 2024-03-20 00:00:00.000000
 
 """
+import os
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
@@ -15,157 +16,335 @@ down_revision = None
 branch_labels = None
 depends_on = None
 
+# Storage roots known at install time; rendered episodes are written
+# under output/ by default
+STORAGE_ROOTS = [
+    uri.strip()
+    for uri in os.getenv("STORAGE_ROOTS", "output").split(",")
+    if uri.strip()
+]
+
+# Rows per multi-row INSERT when loading seed data
+SEED_BATCH_SIZE = 500
+
+# Native enums for low-cardinality status and role columns; created
+# explicitly so create_table does not try to create them again
+SERIES_STATUS = postgresql.ENUM('active', 'completed', 'paused', name='series_status', create_type=False)
+EPISODE_STATUS = postgresql.ENUM('draft', 'approved', 'published', name='episode_status', create_type=False)
+CHARACTER_ROLE = postgresql.ENUM('main', 'supporting', name='character_role', create_type=False)
+VIDEO_STATUS = postgresql.ENUM('processing', 'completed', 'failed', name='video_status', create_type=False)
+ENUM_TYPES = [SERIES_STATUS, EPISODE_STATUS, CHARACTER_ROLE, VIDEO_STATUS]
+
+# Foreign keys as (name, table, column, referenced table, ON DELETE
+# action). They are added after the tables and indexes so a bulk load
+# into the empty schema skips per-row checks; NOT VALID followed by
+# VALIDATE checks existing rows without blocking writes for the whole
+# scan. Deleting a series cascades through everything generated for it
+# in one statement; storage roots cannot be deleted while videos use them.
+# youtube_uploads.video_id has no foreign key: episode videos are kept in
+# the local VideoMemory store, not in the videos table
+FOREIGN_KEYS = [
+    ('fk_episodes_series', 'episodes', 'series_id', 'series', 'CASCADE'),
+    ('fk_characters_series', 'characters', 'series_id', 'series', 'CASCADE'),
+    ('fk_character_states_series', 'character_states', 'series_id', 'series', 'CASCADE'),
+    ('fk_character_states_episode', 'character_states', 'episode_id', 'episodes', 'CASCADE'),
+    ('fk_character_states_character', 'character_states', 'character_id', 'characters', 'CASCADE'),
+    ('fk_videos_episode', 'videos', 'episode_id', 'episodes', 'CASCADE'),
+    ('fk_videos_root', 'videos', 'root_id', 'storage_roots', 'RESTRICT'),
+    ('fk_youtube_data_series', 'youtube_data', 'series_id', 'series', 'CASCADE'),
+    ('fk_youtube_uploads_channel', 'youtube_uploads', 'channel_id', 'youtube_data', 'CASCADE')
+]
+
+# Unbounded text columns stored inline when they compress small enough
+MAIN_STORAGE_COLUMNS = [
+    ('series', 'description'),
+    ('episodes', 'summary'),
+    ('characters', 'background'),
+    ('youtube_data', 'channel_description')
+]
+
+# Page fill percentage for tables whose rows are updated in place
+UPDATE_FILLFACTOR = 70
+
+# Hash partitions of character_states
+CHARACTER_STATE_PARTITIONS = 8
+
+# PostgreSQL cannot add NOT VALID foreign keys to partitioned tables
+PARTITIONED_TABLES = {'character_states'}
+
 def upgrade():
+    # gen_random_uuid() for server-side ID defaults (built in from
+    # PostgreSQL 13, provided by pgcrypto before that)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    
+    # Create enum types
+    for enum_type in ENUM_TYPES:
+        enum_type.create(op.get_bind(), checkfirst=True)
+    
     # Create series table
     op.create_table(
         'series',
-        sa.Column('id', sa.String(50), primary_key=True),
+        sa.Column('id', postgresql.UUID(as_uuid=False), primary_key=True, server_default=sa.text('gen_random_uuid()')),
         sa.Column('title', sa.String(200), nullable=False),
         sa.Column('genre', sa.String(100), nullable=False),
         sa.Column('description', sa.Text, nullable=False),
         sa.Column('total_episodes', sa.Integer, nullable=False),
         sa.Column('target_audience', sa.String(100), nullable=False),
         sa.Column('tone', sa.String(100), nullable=False),
-        sa.Column('themes', postgresql.JSON, nullable=False),
-        sa.Column('status', sa.String(50), nullable=False, server_default='active'),
-        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.Column('updated_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
+        sa.Column('themes', postgresql.JSONB, nullable=False),
+        sa.Column('status', SERIES_STATUS, nullable=False, server_default='active'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
     )
     
     # Create episodes table
     op.create_table(
         'episodes',
-        sa.Column('id', sa.String(50), primary_key=True),
-        sa.Column('series_id', sa.String(50), sa.ForeignKey('series.id'), nullable=False),
-        sa.Column('episode_number', sa.Integer, nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('series_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('episode_number', sa.SmallInteger, nullable=False),
         sa.Column('title', sa.String(200), nullable=False),
-        sa.Column('script', postgresql.JSON, nullable=False),
+        sa.Column('script', postgresql.JSONB, nullable=False),
         sa.Column('summary', sa.Text, nullable=False),
-        sa.Column('key_events', postgresql.JSON, nullable=False),
-        sa.Column('character_developments', postgresql.JSON, nullable=False),
-        sa.Column('relationship_changes', postgresql.JSON, nullable=False),
-        sa.Column('unresolved_plots', postgresql.JSON, nullable=False),
-        sa.Column('cliffhanger', sa.Text, nullable=False),
-        sa.Column('status', sa.String(50), nullable=False, server_default='draft'),
-        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.Column('updated_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
+        sa.Column('key_events', postgresql.JSONB, nullable=False),
+        sa.Column('character_developments', postgresql.JSONB, nullable=False),
+        sa.Column('relationship_changes', postgresql.JSONB, nullable=False),
+        sa.Column('unresolved_plots', postgresql.JSONB, nullable=False),
+        sa.Column('cliffhanger', sa.String(1000), nullable=False),
+        sa.Column('status', EPISODE_STATUS, nullable=False, server_default='draft'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
     )
     
     # Create characters table
     op.create_table(
         'characters',
-        sa.Column('id', sa.String(50), primary_key=True),
-        sa.Column('series_id', sa.String(50), sa.ForeignKey('series.id'), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('series_id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('name', sa.String(100), nullable=False),
-        sa.Column('role', sa.String(50), nullable=False),
-        sa.Column('age', sa.Integer, nullable=False),
+        sa.Column('role', CHARACTER_ROLE, nullable=False),
+        sa.Column('age', sa.SmallInteger, nullable=False),
         sa.Column('occupation', sa.String(100), nullable=False),
-        sa.Column('personality', postgresql.JSON, nullable=False),
+        sa.Column('personality', postgresql.ARRAY(sa.Text), nullable=False),
         sa.Column('background', sa.Text, nullable=False),
-        sa.Column('goals', postgresql.JSON, nullable=False),
-        sa.Column('secrets', postgresql.JSON, nullable=False),
+        sa.Column('goals', postgresql.JSONB, nullable=False),
+        sa.Column('secrets', postgresql.JSONB, nullable=False),
         sa.Column('avatar_id', sa.String(100), nullable=True),
         sa.Column('voice_id', sa.String(100), nullable=True),
-        sa.Column('profile', postgresql.JSON, nullable=False),
-        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.Column('updated_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
+        sa.Column('profile', postgresql.JSONB, nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
     )
     
-    # Create character_states table
+    # Create character_states table, hash-partitioned by series so each
+    # partition's heap and indexes stay small and scans by series prune
+    # to one partition; the key must be part of the primary key
     op.create_table(
         'character_states',
-        sa.Column('id', sa.String(50), primary_key=True),
-        sa.Column('series_id', sa.String(50), sa.ForeignKey('series.id'), nullable=False),
-        sa.Column('episode_id', sa.String(50), sa.ForeignKey('episodes.id'), nullable=False),
-        sa.Column('character_id', sa.String(50), sa.ForeignKey('characters.id'), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('series_id', postgresql.UUID(as_uuid=False), primary_key=True),
+        sa.Column('episode_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('character_id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('emotional_state', sa.String(100), nullable=False),
         sa.Column('location', sa.String(200), nullable=False),
-        sa.Column('active_goals', postgresql.JSON, nullable=False),
-        sa.Column('resolved_goals', postgresql.JSON, nullable=False),
-        sa.Column('new_traits', postgresql.JSON, nullable=False),
-        sa.Column('current_situation', sa.Text, nullable=False),
-        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.Column('updated_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
+        sa.Column('active_goals', postgresql.ARRAY(sa.Text), nullable=False),
+        sa.Column('resolved_goals', postgresql.ARRAY(sa.Text), nullable=False),
+        sa.Column('new_traits', postgresql.ARRAY(sa.Text), nullable=False),
+        sa.Column('current_situation', sa.String(1000), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        postgresql_partition_by='HASH (series_id)'
+    )
+    for remainder in range(CHARACTER_STATE_PARTITIONS):
+        op.execute(
+            f"CREATE TABLE character_states_p{remainder} PARTITION OF character_states "
+            f"FOR VALUES WITH (MODULUS {CHARACTER_STATE_PARTITIONS}, REMAINDER {remainder}) "
+            f"WITH (fillfactor = {UPDATE_FILLFACTOR})"
+        )
+    
+    # Create storage_roots table; videos store a root ID and a path
+    # relative to it instead of repeating the full location on every row
+    storage_roots = op.create_table(
+        'storage_roots',
+        sa.Column('id', sa.SmallInteger, sa.Identity(), primary_key=True),
+        sa.Column('uri', sa.String(500), nullable=False, unique=True)
     )
     
     # Create videos table
     op.create_table(
         'videos',
-        sa.Column('id', sa.String(50), primary_key=True),
-        sa.Column('episode_id', sa.String(50), sa.ForeignKey('episodes.id'), nullable=False),
-        sa.Column('file_path', sa.String(500), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('episode_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('root_id', sa.SmallInteger, nullable=False),
+        sa.Column('path_suffix', sa.String(200), nullable=False),
         sa.Column('duration', sa.Integer, nullable=False),
-        sa.Column('scenes', postgresql.JSON, nullable=False),
-        sa.Column('metadata', postgresql.JSON, nullable=False),
-        sa.Column('status', sa.String(50), nullable=False, server_default='processing'),
-        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.Column('updated_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
+        sa.Column('scenes', postgresql.JSONB, nullable=False),
+        sa.Column('video_metadata', postgresql.JSONB, nullable=False),
+        sa.Column('status', VIDEO_STATUS, nullable=False, server_default='processing'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
     )
     
     # Create youtube_data table
     op.create_table(
         'youtube_data',
-        sa.Column('id', sa.String(50), primary_key=True),
-        sa.Column('series_id', sa.String(50), sa.ForeignKey('series.id'), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('series_id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('channel_id', sa.String(100), nullable=False),
         sa.Column('playlist_id', sa.String(100), nullable=False),
         sa.Column('channel_name', sa.String(200), nullable=False),
         sa.Column('channel_description', sa.Text, nullable=False),
-        sa.Column('subscriber_count', sa.Integer, nullable=False, server_default='0'),
-        sa.Column('view_count', sa.Integer, nullable=False, server_default='0'),
-        sa.Column('video_count', sa.Integer, nullable=False, server_default='0'),
-        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.Column('updated_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
+        sa.Column('subscriber_count', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
     )
     
     # Create youtube_uploads table
     op.create_table(
         'youtube_uploads',
-        sa.Column('id', sa.String(50), primary_key=True),
-        sa.Column('video_id', sa.String(50), sa.ForeignKey('videos.id'), nullable=False),
-        sa.Column('channel_id', sa.String(50), sa.ForeignKey('youtube_data.id'), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=False), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('video_id', postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column('channel_id', postgresql.UUID(as_uuid=False), nullable=False),
         sa.Column('youtube_video_id', sa.String(100), nullable=False),
         sa.Column('title', sa.String(200), nullable=False),
         sa.Column('description', sa.Text, nullable=False),
-        sa.Column('tags', postgresql.JSON, nullable=False),
-        sa.Column('view_count', sa.Integer, nullable=False, server_default='0'),
-        sa.Column('like_count', sa.Integer, nullable=False, server_default='0'),
-        sa.Column('comment_count', sa.Integer, nullable=False, server_default='0'),
-        sa.Column('published_at', sa.DateTime, nullable=False),
-        sa.Column('created_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
-        sa.Column('updated_at', sa.DateTime, nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
+        sa.Column('tags', postgresql.JSONB, nullable=False),
+        sa.Column('view_count', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('like_count', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('comment_count', sa.BigInteger, nullable=False, server_default='0'),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
     )
     
+    # Seed data is loaded with multi-row inserts in fixed-size batches
+    # before indexes exist, never one statement per row
+    seed_rows = [{'uri': uri} for uri in STORAGE_ROOTS]
+    for start in range(0, len(seed_rows), SEED_BATCH_SIZE):
+        op.bulk_insert(storage_roots, seed_rows[start:start + SEED_BATCH_SIZE], multiinsert=True)
+    
     # Create indexes
     op.create_index('ix_series_title', 'series', ['title'])
-    op.create_index('ix_episodes_series_id', 'episodes', ['series_id'])
-    op.create_index('ix_episodes_episode_number', 'episodes', ['episode_number'])
+    # One index serves both "episodes of a series in order" and "episode N
+    # of a series", and rejects duplicate episode numbers
+    op.create_index('ix_episodes_series_episode', 'episodes', ['series_id', 'episode_number'], unique=True)
     op.create_index('ix_characters_series_id', 'characters', ['series_id'])
-    op.create_index('ix_character_states_episode_id', 'character_states', ['episode_id'])
-    op.create_index('ix_character_states_character_id', 'character_states', ['character_id'])
+    # Covering index so "state of character C in episode E of series S"
+    # is a single index-only scan
+    op.create_index(
+        'ix_character_states_triple',
+        'character_states',
+        ['series_id', 'episode_id', 'character_id'],
+        postgresql_include=['emotional_state', 'location']
+    )
     op.create_index('ix_videos_episode_id', 'videos', ['episode_id'])
-    op.create_index('ix_youtube_data_series_id', 'youtube_data', ['series_id'])
+    op.create_index('ix_youtube_data_series_id', 'youtube_data', ['series_id'], unique=True)
     op.create_index('ix_youtube_uploads_video_id', 'youtube_uploads', ['video_id'])
     op.create_index('ix_youtube_uploads_channel_id', 'youtube_uploads', ['channel_id'])
+    op.create_index('ix_youtube_uploads_youtube_video_id', 'youtube_uploads', ['youtube_video_id'], unique=True)
+    op.create_index('ix_upload_channel_published', 'youtube_uploads', ['channel_id', 'published_at'])
+    
+    # GIN indexes for JSONB containment (@>) filters; jsonb_path_ops is
+    # smaller than the default opclass and @> is the only operator used
+    op.create_index('ix_series_themes_gin', 'series', ['themes'], postgresql_using='gin', postgresql_ops={'themes': 'jsonb_path_ops'})
+    op.create_index('ix_episodes_key_events_gin', 'episodes', ['key_events'], postgresql_using='gin', postgresql_ops={'key_events': 'jsonb_path_ops'})
+    op.create_index('ix_characters_goals_gin', 'characters', ['goals'], postgresql_using='gin', postgresql_ops={'goals': 'jsonb_path_ops'})
+    op.create_index('ix_characters_secrets_gin', 'characters', ['secrets'], postgresql_using='gin', postgresql_ops={'secrets': 'jsonb_path_ops'})
+    op.create_index('ix_videos_scenes_gin', 'videos', ['scenes'], postgresql_using='gin', postgresql_ops={'scenes': 'jsonb_path_ops'})
+    op.create_index('ix_videos_video_metadata_gin', 'videos', ['video_metadata'], postgresql_using='gin', postgresql_ops={'video_metadata': 'jsonb_path_ops'})
+    op.create_index('ix_youtube_uploads_tags_gin', 'youtube_uploads', ['tags'], postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'})
+    
+    # GIN indexes on text arrays for @> and && filters
+    op.create_index('ix_characters_personality_gin', 'characters', ['personality'], postgresql_using='gin')
+    op.create_index('ix_character_states_active_goals_gin', 'character_states', ['active_goals'], postgresql_using='gin')
+    
+    # BRIN indexes for time-range scans on append-only tables; rows arrive
+    # in created_at order, so min/max summaries per block range stay tight
+    op.create_index('ix_character_states_created_at_brin', 'character_states', ['created_at'], postgresql_using='brin', postgresql_with={'pages_per_range': 32})
+    op.create_index('ix_videos_created_at_brin', 'videos', ['created_at'], postgresql_using='brin', postgresql_with={'pages_per_range': 32})
+    op.create_index('ix_youtube_uploads_created_at_brin', 'youtube_uploads', ['created_at'], postgresql_using='brin', postgresql_with={'pages_per_range': 32})
+    
+    # Leave free space in each page of frequently updated tables so updates
+    # stay on the same page as HOT updates and skip index maintenance;
+    # character_states partitions set it when created
+    for table in ('episodes', 'videos', 'youtube_uploads'):
+        op.execute(f"ALTER TABLE {table} SET (fillfactor = {UPDATE_FILLFACTOR})")
+    
+    # Keep long prose inline (compressed) rather than moving it out of
+    # line to TOAST, so typical row fetches take one heap visit
+    for table, column in MAIN_STORAGE_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET STORAGE MAIN")
+    
+    # Create foreign keys
+    for name, table, column, referent, ondelete in FOREIGN_KEYS:
+        not_valid = "" if table in PARTITIONED_TABLES else " NOT VALID"
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} "
+            f"FOREIGN KEY ({column}) REFERENCES {referent} (id) "
+            f"ON DELETE {ondelete}{not_valid}"
+        )
+    for name, table, column, referent, ondelete in FOREIGN_KEYS:
+        if table not in PARTITIONED_TABLES:
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+    
+    # Per-channel totals are aggregated from uploads on a schedule instead
+    # of being updated on the youtube_data row; created with data (empty)
+    # since a never-populated view cannot be refreshed concurrently, and
+    # the unique index is what allows concurrent refreshes
+    op.execute("""
+        CREATE MATERIALIZED VIEW youtube_channel_stats AS
+        SELECT channel_id, SUM(view_count) AS view_count, COUNT(*) AS video_count
+        FROM youtube_uploads
+        GROUP BY channel_id
+    """)
+    op.create_index('ix_youtube_channel_stats_channel_id', 'youtube_channel_stats', ['channel_id'], unique=True)
 
 def downgrade():
+    # Drop channel stats view
+    op.execute("DROP MATERIALIZED VIEW youtube_channel_stats")
+    
+    # Drop foreign keys
+    for name, table, column, referent, ondelete in reversed(FOREIGN_KEYS):
+        op.drop_constraint(name, table, type_='foreignkey')
+    
+    # Drop BRIN indexes
+    op.drop_index('ix_youtube_uploads_created_at_brin')
+    op.drop_index('ix_videos_created_at_brin')
+    op.drop_index('ix_character_states_created_at_brin')
+    
+    # Drop GIN indexes
+    op.drop_index('ix_character_states_active_goals_gin')
+    op.drop_index('ix_youtube_uploads_tags_gin')
+    op.drop_index('ix_videos_video_metadata_gin')
+    op.drop_index('ix_videos_scenes_gin')
+    op.drop_index('ix_characters_secrets_gin')
+    op.drop_index('ix_characters_goals_gin')
+    op.drop_index('ix_characters_personality_gin')
+    op.drop_index('ix_episodes_key_events_gin')
+    op.drop_index('ix_series_themes_gin')
+    
     # Drop indexes
+    op.drop_index('ix_upload_channel_published')
+    op.drop_index('ix_youtube_uploads_youtube_video_id')
     op.drop_index('ix_youtube_uploads_channel_id')
     op.drop_index('ix_youtube_uploads_video_id')
     op.drop_index('ix_youtube_data_series_id')
     op.drop_index('ix_videos_episode_id')
-    op.drop_index('ix_character_states_character_id')
-    op.drop_index('ix_character_states_episode_id')
+    op.drop_index('ix_character_states_triple')
     op.drop_index('ix_characters_series_id')
-    op.drop_index('ix_episodes_episode_number')
-    op.drop_index('ix_episodes_series_id')
+    op.drop_index('ix_episodes_series_episode')
     op.drop_index('ix_series_title')
     
     # Drop tables
     op.drop_table('youtube_uploads')
     op.drop_table('youtube_data')
     op.drop_table('videos')
+    op.drop_table('storage_roots')
     op.drop_table('character_states')
     op.drop_table('characters')
     op.drop_table('episodes')
-    op.drop_table('series') 
\ No newline at end of file
+    op.drop_table('series')
+    
+    # Drop enum types
+    for enum_type in reversed(ENUM_TYPES):
+        enum_type.drop(op.get_bind(), checkfirst=True)